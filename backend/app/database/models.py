@@ -1,7 +1,7 @@
 """
 SQLAlchemy ORM Models for PostgreSQL
 """
-from sqlalchemy import Column, String, Float, DateTime, ForeignKey, Text, Enum as SQLEnum, Integer, Boolean, Index
+from sqlalchemy import Column, String, Float, DateTime, ForeignKey, Text, Enum as SQLEnum, Integer, Boolean, Index, text
 from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import relationship
@@ -265,6 +265,10 @@ class SecurityMetadataOverride(Base):
 
 class Transaction(Base):
     __tablename__ = "transactions"
+    __table_args__ = (
+        # Per-account balance ordering: calendar day, credits before debits, id (migration 020)
+        Index('idx_transactions_account_day_total_id', 'account_id', text('CAST(date AS DATE)'), text('total DESC'), 'id'),
+    )
 
     id = Column(String, primary_key=True)
     account_id = Column(String, ForeignKey("accounts.id", ondelete="CASCADE"), nullable=False, index=True)
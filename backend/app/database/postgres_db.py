@@ -34,6 +34,8 @@ def init_db(database_url: str):
         database_url,
         pool_pre_ping=True,  # Verify connections before using them
         echo=False,  # Set to True for SQL query logging
+        # psycopg2: multi-row VALUES for executemany INSERTs, execute_batch for UPDATE/DELETE
+        executemany_mode="values_plus_batch",
     )
 
     # Create session factory
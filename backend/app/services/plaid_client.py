@@ -4,9 +4,11 @@ Plaid API Client Service
 Handles all interactions with Plaid API for account linking and transaction syncing.
 """
 import logging
+import math
 from typing import Optional, Dict, List, Any
 from datetime import datetime
 
+import orjson
 import plaid
 from plaid.api import plaid_api
 from plaid.model.link_token_create_request import LinkTokenCreateRequest
@@ -28,6 +30,10 @@ from app.config import settings
 
 logger = logging.getLogger(__name__)
 
+# Largest page Plaid accepts for /transactions/sync, /transactions/get and
+# /investments/transactions/get; fewer, fuller pages mean fewer round-trips.
+PLAID_MAX_PAGE_SIZE = 500
+
 
 class PlaidClient:
     """Client for interacting with Plaid API"""
@@ -235,7 +241,7 @@ class PlaidClient:
         self,
         access_token: str,
         cursor: Optional[str] = None,
-        count: int = 500
+        count: int = PLAID_MAX_PAGE_SIZE
     ) -> Optional[Dict[str, Any]]:
         """
         Sync transactions using cursor-based pagination
@@ -255,7 +261,7 @@ class PlaidClient:
         try:
             request_args = {
                 "access_token": access_token,
-                "count": min(count, 500),
+                "count": min(count, PLAID_MAX_PAGE_SIZE),
             }
 
             if cursor:
@@ -264,7 +270,7 @@ class PlaidClient:
             logger.info(f"[PLAID DEBUG] Syncing regular transactions:")
             # Security: Access token removed from logs
             logger.info(f"  Cursor: {cursor[:50] if cursor else 'None (initial sync)'}...")
-            logger.info(f"  Count: {min(count, 500)}")
+            logger.info(f"  Count: {min(count, PLAID_MAX_PAGE_SIZE)}")
 
             request = TransactionsSyncRequest(**request_args)
             response = self.client.transactions_sync(request)
@@ -323,7 +329,7 @@ class PlaidClient:
         access_token: str,
         start_date: str,
         end_date: str,
-        count: int = 500,
+        count: int = PLAID_MAX_PAGE_SIZE,
         offset: int = 0
     ) -> Optional[Dict[str, Any]]:
         """
@@ -357,7 +363,7 @@ class PlaidClient:
             logger.info(f"  Count: {count}, Offset: {offset}")
 
             options = TransactionsGetRequestOptions(
-                count=min(count, 500),
+                count=min(count, PLAID_MAX_PAGE_SIZE),
                 offset=offset
             )
 
@@ -405,7 +411,7 @@ class PlaidClient:
         access_token: str,
         start_date: str,
         end_date: str,
-        count: int = 500,
+        count: int = PLAID_MAX_PAGE_SIZE,
         offset: int = 0
     ) -> Optional[Dict[str, Any]]:
         """
@@ -440,7 +446,7 @@ class PlaidClient:
             from plaid.model.investments_transactions_get_request_options import InvestmentsTransactionsGetRequestOptions
 
             options = InvestmentsTransactionsGetRequestOptions(
-                count=min(count, 500),
+                count=min(count, PLAID_MAX_PAGE_SIZE),
                 offset=offset
             )
 
@@ -534,7 +540,6 @@ class PlaidClient:
                     timestamp = datetime.utcnow().strftime("%Y%m%d_%H%M%S")
                     debug_file = debug_dir / f"holdings_{timestamp}.json"
 
-                    import json
                     debug_data = {
                         "timestamp": datetime.utcnow().isoformat(),
                         "holdings_count": len(holdings),
@@ -544,8 +549,9 @@ class PlaidClient:
                         "securities": securities,
                         "accounts": accounts
                     }
-                    with open(debug_file, 'w') as f:
-                        json.dump(debug_data, f, indent=2, default=str)
+                    debug_file.write_bytes(orjson.dumps(
+                        debug_data, default=str, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS
+                    ))
                     logger.info(f"[PLAID HOLDINGS] Saved full holdings data to {debug_file}")
                 except Exception as e:
                     logger.warning(f"[PLAID HOLDINGS] Failed to save holdings debug data: {e}")
@@ -554,6 +560,12 @@ class PlaidClient:
             # Cash = Total Account Value - Sum(Holding Values)
             account_cash_balances = {}
 
+            # Index securities and group holdings by account once instead of scanning per holding
+            securities_by_id = {s.get('security_id'): s for s in securities}
+            holdings_by_account = {}
+            for holding in holdings:
+                holdings_by_account.setdefault(holding.get('account_id'), []).append(holding)
+
             for account in accounts:
                 if account.get('type') == 'investment':
                     account_id = account.get('account_id')
@@ -561,18 +573,14 @@ class PlaidClient:
                     total_value = account.get('balances', {}).get('current', 0) or 0
 
                     # Calculate total value of holdings for this account
-                    holdings_value = 0
-                    for holding in holdings:
-                        if holding.get('account_id') == account_id:
-                            # Get security info to find current price
-                            security_id = holding.get('security_id')
-                            security = next((s for s in securities if s.get('security_id') == security_id), None)
-
-                            if security:
-                                # Use close_price from security, fall back to institution_price
-                                price = security.get('close_price') or holding.get('institution_price', 0)
-                                quantity = holding.get('quantity', 0)
-                                holdings_value += (price * quantity)
+                    # Use close_price from security, fall back to institution_price
+                    holding_values = []
+                    for holding in holdings_by_account.get(account_id, []):
+                        security = securities_by_id.get(holding.get('security_id'))
+                        if security:
+                            price = security.get('close_price') or holding.get('institution_price', 0)
+                            holding_values.append(price * holding.get('quantity', 0))
+                    holdings_value = math.fsum(holding_values)
 
                     # Cash = Total - Holdings
                     cash_balance = total_value - holdings_value
@@ -5,11 +5,12 @@ Utility to replay Plaid syncs from saved debug data without making API calls.
 Useful for testing, debugging, and fixing sync issues.
 """
 import logging
-import json
 from pathlib import Path
-from typing import Optional, Dict, Any, List
+from typing import Optional, Dict, Any, Iterator, List
 from datetime import datetime
 
+import orjson
+
 logger = logging.getLogger(__name__)
 
 PLAID_DEBUG_DIR = Path("/app/logs/plaid_debug")
@@ -67,8 +68,7 @@ def load_debug_data(file_path: Path) -> Optional[Dict[str, Any]]:
         Parsed JSON data, or None if failed
     """
     try:
-        with open(file_path, 'r') as f:
-            data = json.load(f)
+        data = orjson.loads(file_path.read_bytes())
 
         logger.info(f"Loaded debug data from {file_path}")
         return data
@@ -127,15 +127,19 @@ def get_latest_sync_data(user_id: str, plaid_item_id: str) -> Optional[Dict[str,
     return sync_data
 
 
-def extract_transactions_from_debug_data(debug_data: Dict[str, Any]) -> Dict[str, Any]:
+def iter_transaction_pages_from_debug_data(debug_data: Dict[str, Any]) -> Iterator[Dict[str, Any]]:
     """
-    Extract transaction sync data from debug file
+    Extract transaction sync data from debug file, one page at a time
+
+    A full resync file holds one raw response per Plaid page; each is yielded as its
+    own page so replay processes them like a live paginated sync instead of as one
+    combined batch.
 
     Args:
         debug_data: Debug data from file
 
-    Returns:
-        Transaction sync result in the format expected by plaid_sync
+    Yields:
+        Transaction sync results in the format expected by plaid_sync
     """
     sync_type = debug_data.get('sync_type')
 
@@ -143,25 +147,29 @@ def extract_transactions_from_debug_data(debug_data: Dict[str, Any]) -> Dict[str
         # Full resync format: raw_plaid_responses is a list of paginated responses
         raw_responses = debug_data.get('raw_plaid_responses', [])
 
-        # Combine all transactions from all pages
-        all_transactions = []
-        for response in raw_responses:
-            transactions = response.get('transactions', [])
-            all_transactions.extend(transactions)
+        for page_number, response in enumerate(raw_responses, 1):
+            yield {
+                'added': response.get('transactions', []),
+                'modified': [],
+                'removed': [],
+                'next_cursor': None,
+                'has_more': page_number < len(raw_responses)
+            }
 
-        return {
-            'added': all_transactions,
-            'modified': [],
-            'removed': [],
-            'next_cursor': None,
-            'has_more': False
-        }
+        if not raw_responses:
+            yield {
+                'added': [],
+                'modified': [],
+                'removed': [],
+                'next_cursor': None,
+                'has_more': False
+            }
 
     elif sync_type == 'incremental':
         # Incremental sync format: single raw_plaid_response
         raw_response = debug_data.get('raw_plaid_response', {})
 
-        return {
+        yield {
             'added': raw_response.get('added', []),
             'modified': raw_response.get('modified', []),
             'removed': raw_response.get('removed', []),
@@ -171,7 +179,7 @@ def extract_transactions_from_debug_data(debug_data: Dict[str, Any]) -> Dict[str
 
     else:
         logger.warning(f"Unknown sync type: {sync_type}")
-        return {
+        yield {
             'added': [],
             'modified': [],
             'removed': [],
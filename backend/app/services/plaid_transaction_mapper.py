@@ -11,9 +11,13 @@ from typing import Dict, Any, List, Optional, Tuple
 from sqlalchemy.orm import Session
 
 from app.database.models import Transaction, Expense, Account
+from app.services.transaction_classifier import transaction_classifier
 
 logger = logging.getLogger(__name__)
 
+# Trailing parenthesized suffix such as a payment channel: "INTERAC e-Transfer (Online)"
+TRAILING_PARENTHETICAL_RE = re.compile(r'\s*\([^)]*\)\s*$')
+
 
 class PlaidTransactionMapper:
     """Maps Plaid transactions to our database models"""
@@ -43,6 +47,159 @@ class PlaidTransactionMapper:
         "other": "Other"
     }
 
+    # Plaid legacy category hierarchy to our expense categories
+    # This should match the default categories in your system
+    PLAID_CATEGORY_MAP = {
+        "Food and Drink": "Groceries",
+        "Restaurants": "Dining",
+        "Coffee Shop": "Dining",
+        "Fast Food": "Dining",
+        "Gas": "Transportation",
+        "Gas Stations": "Transportation",
+        "Public Transportation": "Transportation",
+        "Ride Share": "Transportation",
+        "Taxi": "Transportation",
+        "Parking": "Transportation",
+        "Travel": "Travel",
+        "Airlines": "Travel",
+        "Lodging": "Travel",
+        "Hotels": "Travel",
+        "Shopping": "Shopping",
+        "Supermarkets and Groceries": "Groceries",
+        "Grocery": "Groceries",
+        "Healthcare": "Healthcare",
+        "Pharmacies": "Healthcare",
+        "Entertainment": "Entertainment",
+        "Recreation": "Entertainment",
+        "Gyms and Fitness Centers": "Entertainment",
+        "Transfer": "Transfer",
+        "Payment": "Payment",
+        "Credit Card": "Payment",
+        "Utilities": "Utilities",
+        "Internet": "Utilities",
+        "Phone": "Utilities",
+        "Cable": "Utilities",
+        "Rent": "Housing",
+        "Home Improvement": "Housing",
+    }
+
+    # Plaid Personal Finance Category (detailed) to our expense categories
+    PFC_CATEGORY_MAP = {
+        # Food & Drink
+        'FOOD_AND_DRINK_GROCERIES': 'Groceries',
+        'FOOD_AND_DRINK_RESTAURANT': 'Dining',
+        'FOOD_AND_DRINK_FAST_FOOD': 'Dining',
+        'FOOD_AND_DRINK_COFFEE': 'Dining',
+        'FOOD_AND_DRINK_BEER_WINE_AND_LIQUOR': 'Dining',
+        'FOOD_AND_DRINK_VENDING_MACHINES': 'Dining',
+        'FOOD_AND_DRINK_OTHER_FOOD_AND_DRINK': 'Dining',
+
+        # Transportation
+        'TRANSPORTATION_GAS': 'Transportation',
+        'TRANSPORTATION_PUBLIC_TRANSIT': 'Transportation',
+        'TRANSPORTATION_TAXIS_AND_RIDE_SHARES': 'Transportation',
+        'TRANSPORTATION_PARKING': 'Transportation',
+        'TRANSPORTATION_TOLLS': 'Transportation',
+        'TRANSPORTATION_BIKES_AND_SCOOTERS': 'Transportation',
+        'TRANSPORTATION_OTHER_TRANSPORTATION': 'Transportation',
+
+        # Travel
+        'TRAVEL_FLIGHTS': 'Travel',
+        'TRAVEL_LODGING': 'Travel',
+        'TRAVEL_RENTAL_CARS': 'Travel',
+        'TRAVEL_OTHER_TRAVEL': 'Travel',
+
+        # Shopping
+        'GENERAL_MERCHANDISE_BOOKSTORES_AND_NEWSSTANDS': 'Shopping',
+        'GENERAL_MERCHANDISE_CLOTHING_AND_ACCESSORIES': 'Shopping',
+        'GENERAL_MERCHANDISE_CONVENIENCE_STORES': 'Shopping',
+        'GENERAL_MERCHANDISE_DEPARTMENT_STORES': 'Shopping',
+        'GENERAL_MERCHANDISE_DISCOUNT_STORES': 'Shopping',
+        'GENERAL_MERCHANDISE_ELECTRONICS': 'Shopping',
+        'GENERAL_MERCHANDISE_GIFTS_AND_NOVELTIES': 'Shopping',
+        'GENERAL_MERCHANDISE_OFFICE_SUPPLIES': 'Shopping',
+        'GENERAL_MERCHANDISE_ONLINE_MARKETPLACES': 'Shopping',
+        'GENERAL_MERCHANDISE_PET_SUPPLIES': 'Shopping',
+        'GENERAL_MERCHANDISE_SPORTING_GOODS': 'Shopping',
+        'GENERAL_MERCHANDISE_SUPERSTORES': 'Shopping',
+        'GENERAL_MERCHANDISE_TOBACCO_AND_VAPE': 'Shopping',
+        'GENERAL_MERCHANDISE_OTHER_GENERAL_MERCHANDISE': 'Shopping',
+
+        # Entertainment
+        'ENTERTAINMENT_CASINOS_AND_GAMBLING': 'Entertainment',
+        'ENTERTAINMENT_MUSIC_AND_AUDIO': 'Entertainment',
+        'ENTERTAINMENT_SPORTING_EVENTS_AMUSEMENT_PARKS_AND_MUSEUMS': 'Entertainment',
+        'ENTERTAINMENT_TV_AND_MOVIES': 'Entertainment',
+        'ENTERTAINMENT_VIDEO_GAMES': 'Entertainment',
+        'ENTERTAINMENT_OTHER_ENTERTAINMENT': 'Entertainment',
+
+        # Healthcare
+        'MEDICAL_DENTAL_CARE': 'Healthcare',
+        'MEDICAL_EYE_CARE': 'Healthcare',
+        'MEDICAL_NURSING_CARE': 'Healthcare',
+        'MEDICAL_PHARMACIES_AND_SUPPLEMENTS': 'Healthcare',
+        'MEDICAL_PRIMARY_CARE': 'Healthcare',
+        'MEDICAL_VETERINARY_SERVICES': 'Healthcare',
+        'MEDICAL_OTHER_MEDICAL': 'Healthcare',
+
+        # Personal Care
+        'PERSONAL_CARE_GYMS_AND_FITNESS_CENTERS': 'Entertainment',
+        'PERSONAL_CARE_HAIR_AND_BEAUTY': 'Personal Care',
+        'PERSONAL_CARE_LAUNDRY_AND_DRY_CLEANING': 'Personal Care',
+        'PERSONAL_CARE_OTHER_PERSONAL_CARE': 'Personal Care',
+
+        # Housing
+        'HOME_IMPROVEMENT_FURNITURE': 'Housing',
+        'HOME_IMPROVEMENT_HARDWARE': 'Housing',
+        'HOME_IMPROVEMENT_REPAIR_AND_MAINTENANCE': 'Housing',
+        'HOME_IMPROVEMENT_SECURITY': 'Housing',
+        'HOME_IMPROVEMENT_OTHER_HOME_IMPROVEMENT': 'Housing',
+        'RENT_AND_UTILITIES_RENT': 'Housing',
+        'RENT_AND_UTILITIES_GAS_AND_ELECTRICITY': 'Utilities',
+        'RENT_AND_UTILITIES_INTERNET_AND_CABLE': 'Utilities',
+        'RENT_AND_UTILITIES_SEWAGE_AND_WASTE_MANAGEMENT': 'Utilities',
+        'RENT_AND_UTILITIES_TELEPHONE': 'Utilities',
+        'RENT_AND_UTILITIES_WATER': 'Utilities',
+        'RENT_AND_UTILITIES_OTHER_UTILITIES': 'Utilities',
+
+        # Income & Transfers In
+        'INCOME_WAGES': 'Salary',
+        'INCOME_DIVIDENDS': 'Dividends',
+        'INCOME_INTEREST_EARNED': 'Interest',
+        'INCOME_RETIREMENT_PENSION': 'Retirement Income',
+        'INCOME_TAX_REFUND': 'Tax Refund',
+        'INCOME_UNEMPLOYMENT': 'Unemployment',
+        'INCOME_OTHER_INCOME': 'Other Income',
+        'TRANSFER_IN_DEPOSIT': 'Deposit',
+        'TRANSFER_IN_CASH_ADVANCES_AND_LOANS': 'Transfer',
+        'TRANSFER_IN_INVESTMENT_AND_RETIREMENT_FUNDS': 'Investment Transfer',
+        'TRANSFER_IN_SAVINGS': 'Savings Transfer',
+        'TRANSFER_IN_ACCOUNT_TRANSFER': 'Transfer',
+        'TRANSFER_IN_OTHER_TRANSFER_IN': 'Transfer',
+        'TRANSFER_OUT_INVESTMENT_AND_RETIREMENT_FUNDS': 'Transfer',
+        'TRANSFER_OUT_SAVINGS': 'Transfer',
+        'TRANSFER_OUT_WITHDRAWAL': 'Transfer',
+        'TRANSFER_OUT_ACCOUNT_TRANSFER': 'Transfer',
+        'TRANSFER_OUT_OTHER_TRANSFER_OUT': 'Transfer',
+        'LOAN_PAYMENTS_CAR_PAYMENT': 'Payment',
+        'LOAN_PAYMENTS_CREDIT_CARD_PAYMENT': 'Payment',
+        'LOAN_PAYMENTS_PERSONAL_LOAN_PAYMENT': 'Payment',
+        'LOAN_PAYMENTS_MORTGAGE_PAYMENT': 'Payment',
+        'LOAN_PAYMENTS_STUDENT_LOAN_PAYMENT': 'Payment',
+        'LOAN_PAYMENTS_OTHER_PAYMENT': 'Payment',
+
+        # Services
+        'GENERAL_SERVICES_ACCOUNTING_AND_FINANCIAL_PLANNING': 'Services',
+        'GENERAL_SERVICES_AUTOMOTIVE': 'Transportation',
+        'GENERAL_SERVICES_CHILDCARE': 'Services',
+        'GENERAL_SERVICES_CONSULTING_AND_LEGAL': 'Services',
+        'GENERAL_SERVICES_EDUCATION': 'Education',
+        'GENERAL_SERVICES_INSURANCE': 'Insurance',
+        'GENERAL_SERVICES_POSTAGE_AND_SHIPPING': 'Services',
+        'GENERAL_SERVICES_STORAGE': 'Services',
+        'GENERAL_SERVICES_OTHER_GENERAL_SERVICES': 'Services',
+    }
+
     def __init__(self, db: Session):
         """
         Initialize the mapper
@@ -63,7 +220,11 @@ class PlaidTransactionMapper:
             datetime object
         """
         if isinstance(date_value, str):
-            return datetime.strptime(date_value, '%Y-%m-%d')
+            # fromisoformat is much cheaper than strptime for the usual YYYY-MM-DD input
+            try:
+                return datetime.fromisoformat(date_value)
+            except ValueError:
+                return datetime.strptime(date_value, '%Y-%m-%d')
         elif isinstance(date_value, datetime):
             return date_value
         else:
@@ -102,7 +263,6 @@ class PlaidTransactionMapper:
         description = self._build_description(plaid_txn)
 
         # Determine transaction type based on amount using transaction_classifier
-        from app.services.transaction_classifier import transaction_classifier
         txn_type = transaction_classifier.classify_transaction(total)
 
         # Extract Plaid Personal Finance Category (PFC) if available
@@ -129,7 +289,8 @@ class PlaidTransactionMapper:
         plaid_txn: Dict[str, Any],
         account_id: str,
         transaction_id: str,
-        transaction_type: str
+        transaction_type: str,
+        transaction_data: Optional[Dict[str, Any]] = None
     ) -> Optional[Dict[str, Any]]:
         """
         Map a Plaid transaction to an Expense for tracking in the Cashflow page
@@ -142,22 +303,33 @@ class PlaidTransactionMapper:
             account_id: Our account ID
             transaction_id: Associated transaction ID
             transaction_type: Transaction type (Money In or Money Out)
+            transaction_data: Optional map_transaction() result for plaid_txn, whose date,
+                description and PFC fields are reused instead of being derived again
 
         Returns:
             Dictionary for Expense model creation
         """
-        # Parse date
-        date = self._parse_plaid_date(plaid_txn['date'])
+        if transaction_data is not None:
+            date = transaction_data['date']
+            description = transaction_data['description']
+            pfc_data = {
+                'primary': transaction_data['pfc_primary'],
+                'detailed': transaction_data['pfc_detailed'],
+                'confidence_level': transaction_data['pfc_confidence']
+            }
+        else:
+            # Parse date
+            date = self._parse_plaid_date(plaid_txn['date'])
 
-        # Build description
-        description = self._build_description(plaid_txn)
+            # Build description
+            description = self._build_description(plaid_txn)
+
+            # Extract Plaid Personal Finance Category (PFC) if available
+            pfc_data = self._extract_pfc(plaid_txn)
 
         # Get category from Plaid (legacy mapping for backward compatibility)
         category = self._map_plaid_category(plaid_txn.get('category', []))
 
-        # Extract Plaid Personal Finance Category (PFC) if available
-        pfc_data = self._extract_pfc(plaid_txn)
-
         # If we have PFC data but no legacy category, try to map PFC to a category
         if not category and pfc_data.get('detailed'):
             category = self._map_pfc_to_category(pfc_data['detailed'])
@@ -295,46 +467,10 @@ class PlaidTransactionMapper:
         if not categories:
             return "Uncategorized"
 
-        # Plaid category mapping to our categories
-        # This should match the default categories in your system
-        category_map = {
-            "Food and Drink": "Groceries",
-            "Restaurants": "Dining",
-            "Coffee Shop": "Dining",
-            "Fast Food": "Dining",
-            "Gas": "Transportation",
-            "Gas Stations": "Transportation",
-            "Public Transportation": "Transportation",
-            "Ride Share": "Transportation",
-            "Taxi": "Transportation",
-            "Parking": "Transportation",
-            "Travel": "Travel",
-            "Airlines": "Travel",
-            "Lodging": "Travel",
-            "Hotels": "Travel",
-            "Shopping": "Shopping",
-            "Supermarkets and Groceries": "Groceries",
-            "Grocery": "Groceries",
-            "Healthcare": "Healthcare",
-            "Pharmacies": "Healthcare",
-            "Entertainment": "Entertainment",
-            "Recreation": "Entertainment",
-            "Gyms and Fitness Centers": "Entertainment",
-            "Transfer": "Transfer",
-            "Payment": "Payment",
-            "Credit Card": "Payment",
-            "Utilities": "Utilities",
-            "Internet": "Utilities",
-            "Phone": "Utilities",
-            "Cable": "Utilities",
-            "Rent": "Housing",
-            "Home Improvement": "Housing",
-        }
-
         # Check each category in the hierarchy
         for category in categories:
-            if category in category_map:
-                return category_map[category]
+            if category in self.PLAID_CATEGORY_MAP:
+                return self.PLAID_CATEGORY_MAP[category]
 
         # If no match, use the primary category or default
         return categories[0] if categories else "Uncategorized"
@@ -368,8 +504,8 @@ class PlaidTransactionMapper:
         # Plaid and Statement have different payment channels but same merchant/name
         # Example: "INTERAC e-Transfer (Online)" vs "INTERAC e-Transfer (Other)"
         # This ONLY strips the payment channel suffix at the END, not merchant details
-        base1 = re.sub(r'\s*\([^)]*\)\s*$', '', desc1).strip()
-        base2 = re.sub(r'\s*\([^)]*\)\s*$', '', desc2).strip()
+        base1 = TRAILING_PARENTHETICAL_RE.sub('', desc1).strip()
+        base2 = TRAILING_PARENTHETICAL_RE.sub('', desc2).strip()
 
         # If base descriptions match exactly, consider it a duplicate
         # This is the most reliable match after exact match
@@ -438,124 +574,7 @@ class PlaidTransactionMapper:
         Returns:
             Our category name
         """
-        # Mapping from PFC detailed categories to our categories
-        pfc_map = {
-            # Food & Drink
-            'FOOD_AND_DRINK_GROCERIES': 'Groceries',
-            'FOOD_AND_DRINK_RESTAURANT': 'Dining',
-            'FOOD_AND_DRINK_FAST_FOOD': 'Dining',
-            'FOOD_AND_DRINK_COFFEE': 'Dining',
-            'FOOD_AND_DRINK_BEER_WINE_AND_LIQUOR': 'Dining',
-            'FOOD_AND_DRINK_VENDING_MACHINES': 'Dining',
-            'FOOD_AND_DRINK_OTHER_FOOD_AND_DRINK': 'Dining',
-
-            # Transportation
-            'TRANSPORTATION_GAS': 'Transportation',
-            'TRANSPORTATION_PUBLIC_TRANSIT': 'Transportation',
-            'TRANSPORTATION_TAXIS_AND_RIDE_SHARES': 'Transportation',
-            'TRANSPORTATION_PARKING': 'Transportation',
-            'TRANSPORTATION_TOLLS': 'Transportation',
-            'TRANSPORTATION_BIKES_AND_SCOOTERS': 'Transportation',
-            'TRANSPORTATION_OTHER_TRANSPORTATION': 'Transportation',
-
-            # Travel
-            'TRAVEL_FLIGHTS': 'Travel',
-            'TRAVEL_LODGING': 'Travel',
-            'TRAVEL_RENTAL_CARS': 'Travel',
-            'TRAVEL_OTHER_TRAVEL': 'Travel',
-
-            # Shopping
-            'GENERAL_MERCHANDISE_BOOKSTORES_AND_NEWSSTANDS': 'Shopping',
-            'GENERAL_MERCHANDISE_CLOTHING_AND_ACCESSORIES': 'Shopping',
-            'GENERAL_MERCHANDISE_CONVENIENCE_STORES': 'Shopping',
-            'GENERAL_MERCHANDISE_DEPARTMENT_STORES': 'Shopping',
-            'GENERAL_MERCHANDISE_DISCOUNT_STORES': 'Shopping',
-            'GENERAL_MERCHANDISE_ELECTRONICS': 'Shopping',
-            'GENERAL_MERCHANDISE_GIFTS_AND_NOVELTIES': 'Shopping',
-            'GENERAL_MERCHANDISE_OFFICE_SUPPLIES': 'Shopping',
-            'GENERAL_MERCHANDISE_ONLINE_MARKETPLACES': 'Shopping',
-            'GENERAL_MERCHANDISE_PET_SUPPLIES': 'Shopping',
-            'GENERAL_MERCHANDISE_SPORTING_GOODS': 'Shopping',
-            'GENERAL_MERCHANDISE_SUPERSTORES': 'Shopping',
-            'GENERAL_MERCHANDISE_TOBACCO_AND_VAPE': 'Shopping',
-            'GENERAL_MERCHANDISE_OTHER_GENERAL_MERCHANDISE': 'Shopping',
-
-            # Entertainment
-            'ENTERTAINMENT_CASINOS_AND_GAMBLING': 'Entertainment',
-            'ENTERTAINMENT_MUSIC_AND_AUDIO': 'Entertainment',
-            'ENTERTAINMENT_SPORTING_EVENTS_AMUSEMENT_PARKS_AND_MUSEUMS': 'Entertainment',
-            'ENTERTAINMENT_TV_AND_MOVIES': 'Entertainment',
-            'ENTERTAINMENT_VIDEO_GAMES': 'Entertainment',
-            'ENTERTAINMENT_OTHER_ENTERTAINMENT': 'Entertainment',
-
-            # Healthcare
-            'MEDICAL_DENTAL_CARE': 'Healthcare',
-            'MEDICAL_EYE_CARE': 'Healthcare',
-            'MEDICAL_NURSING_CARE': 'Healthcare',
-            'MEDICAL_PHARMACIES_AND_SUPPLEMENTS': 'Healthcare',
-            'MEDICAL_PRIMARY_CARE': 'Healthcare',
-            'MEDICAL_VETERINARY_SERVICES': 'Healthcare',
-            'MEDICAL_OTHER_MEDICAL': 'Healthcare',
-
-            # Personal Care
-            'PERSONAL_CARE_GYMS_AND_FITNESS_CENTERS': 'Entertainment',
-            'PERSONAL_CARE_HAIR_AND_BEAUTY': 'Personal Care',
-            'PERSONAL_CARE_LAUNDRY_AND_DRY_CLEANING': 'Personal Care',
-            'PERSONAL_CARE_OTHER_PERSONAL_CARE': 'Personal Care',
-
-            # Housing
-            'HOME_IMPROVEMENT_FURNITURE': 'Housing',
-            'HOME_IMPROVEMENT_HARDWARE': 'Housing',
-            'HOME_IMPROVEMENT_REPAIR_AND_MAINTENANCE': 'Housing',
-            'HOME_IMPROVEMENT_SECURITY': 'Housing',
-            'HOME_IMPROVEMENT_OTHER_HOME_IMPROVEMENT': 'Housing',
-            'RENT_AND_UTILITIES_RENT': 'Housing',
-            'RENT_AND_UTILITIES_GAS_AND_ELECTRICITY': 'Utilities',
-            'RENT_AND_UTILITIES_INTERNET_AND_CABLE': 'Utilities',
-            'RENT_AND_UTILITIES_SEWAGE_AND_WASTE_MANAGEMENT': 'Utilities',
-            'RENT_AND_UTILITIES_TELEPHONE': 'Utilities',
-            'RENT_AND_UTILITIES_WATER': 'Utilities',
-            'RENT_AND_UTILITIES_OTHER_UTILITIES': 'Utilities',
-
-            # Income & Transfers In
-            'INCOME_WAGES': 'Salary',
-            'INCOME_DIVIDENDS': 'Dividends',
-            'INCOME_INTEREST_EARNED': 'Interest',
-            'INCOME_RETIREMENT_PENSION': 'Retirement Income',
-            'INCOME_TAX_REFUND': 'Tax Refund',
-            'INCOME_UNEMPLOYMENT': 'Unemployment',
-            'INCOME_OTHER_INCOME': 'Other Income',
-            'TRANSFER_IN_DEPOSIT': 'Deposit',
-            'TRANSFER_IN_CASH_ADVANCES_AND_LOANS': 'Transfer',
-            'TRANSFER_IN_INVESTMENT_AND_RETIREMENT_FUNDS': 'Investment Transfer',
-            'TRANSFER_IN_SAVINGS': 'Savings Transfer',
-            'TRANSFER_IN_ACCOUNT_TRANSFER': 'Transfer',
-            'TRANSFER_IN_OTHER_TRANSFER_IN': 'Transfer',
-            'TRANSFER_OUT_INVESTMENT_AND_RETIREMENT_FUNDS': 'Transfer',
-            'TRANSFER_OUT_SAVINGS': 'Transfer',
-            'TRANSFER_OUT_WITHDRAWAL': 'Transfer',
-            'TRANSFER_OUT_ACCOUNT_TRANSFER': 'Transfer',
-            'TRANSFER_OUT_OTHER_TRANSFER_OUT': 'Transfer',
-            'LOAN_PAYMENTS_CAR_PAYMENT': 'Payment',
-            'LOAN_PAYMENTS_CREDIT_CARD_PAYMENT': 'Payment',
-            'LOAN_PAYMENTS_PERSONAL_LOAN_PAYMENT': 'Payment',
-            'LOAN_PAYMENTS_MORTGAGE_PAYMENT': 'Payment',
-            'LOAN_PAYMENTS_STUDENT_LOAN_PAYMENT': 'Payment',
-            'LOAN_PAYMENTS_OTHER_PAYMENT': 'Payment',
-
-            # Services
-            'GENERAL_SERVICES_ACCOUNTING_AND_FINANCIAL_PLANNING': 'Services',
-            'GENERAL_SERVICES_AUTOMOTIVE': 'Transportation',
-            'GENERAL_SERVICES_CHILDCARE': 'Services',
-            'GENERAL_SERVICES_CONSULTING_AND_LEGAL': 'Services',
-            'GENERAL_SERVICES_EDUCATION': 'Education',
-            'GENERAL_SERVICES_INSURANCE': 'Insurance',
-            'GENERAL_SERVICES_POSTAGE_AND_SHIPPING': 'Services',
-            'GENERAL_SERVICES_STORAGE': 'Services',
-            'GENERAL_SERVICES_OTHER_GENERAL_SERVICES': 'Services',
-        }
-
-        return pfc_map.get(pfc_detailed, 'Uncategorized')
+        return self.PFC_CATEGORY_MAP.get(pfc_detailed, 'Uncategorized')
 
 
 # Helper function for easy access
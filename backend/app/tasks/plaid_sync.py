@@ -5,16 +5,27 @@ Handles asynchronous transaction syncing from Plaid.
 """
 import logging
 from typing import Optional
-from datetime import datetime, timedelta
+from datetime import date, datetime, timedelta
 from pathlib import Path
+import os
+import time
 import uuid
-import json
+from itertools import chain, groupby
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
 
+import numpy as np
+import orjson
 from rq import get_current_job
+from sqlalchemy import Date, String, and_, any_, cast, delete, func, insert, literal, or_, select
+from sqlalchemy.dialects.postgresql import ARRAY, insert as pg_insert
 
 from app.database.postgres_db import get_db_context
-from app.database.models import PlaidItem, PlaidAccount, PlaidSyncCursor, Transaction, Expense, Account, Dividend
-from app.services.plaid_client import plaid_client
+from app.database.models import (
+    PlaidItem, PlaidAccount, PlaidSyncCursor, Transaction, Expense, Account, Dividend,
+    Position, PositionSnapshot, SecurityType, SecuritySubtype, Sector, Industry, SecurityMetadataOverride
+)
+from app.services.plaid_client import PLAID_MAX_PAGE_SIZE, plaid_client
 from app.services.plaid_transaction_mapper import create_mapper
 from app.services.encryption import encryption_service
 from app.services.transaction_classifier import transaction_classifier
@@ -28,6 +39,205 @@ logger = logging.getLogger(__name__)
 PLAID_DEBUG_DIR = Path("/app/logs/plaid_debug")
 PLAID_DEBUG_DIR.mkdir(parents=True, exist_ok=True)
 
+# Maximum number of concurrent Plaid requests when fetching paginated results
+PLAID_FETCH_MAX_WORKERS = 4
+
+# Minimum number of seconds between job meta saves (one Redis round-trip each)
+# while the stage is unchanged; stage transitions are always saved. Per-row loops
+# report progress on every row and rely on this to keep Redis writes down
+JOB_META_SAVE_INTERVAL = 1.0
+
+# Number of /transactions/sync pages processed between commits; each commit also
+# saves the cursor of its last page
+TRANSACTION_PAGES_PER_COMMIT = 5
+
+# Number of accumulated rows written per bulk INSERT while processing a sync page
+BULK_INSERT_BATCH_SIZE = 1000
+
+# Single background thread writing debug payloads so they don't block the sync
+_DEBUG_WRITER = ThreadPoolExecutor(max_workers=1, thread_name_prefix="plaid-debug")
+
+# Columns overwritten when Plaid sends a transaction we already have
+PLAID_TRANSACTION_UPDATE_COLUMNS = (
+    'date', 'type', 'total', 'description', 'pfc_primary', 'pfc_detailed', 'pfc_confidence', 'import_sequence',
+)
+INVESTMENT_TRANSACTION_UPDATE_COLUMNS = ('date', 'type', 'total', 'description', 'import_sequence')
+
+# Account types where Plaid reports a positive balance for money owed
+LIABILITY_ACCOUNT_TYPES = frozenset({
+    'credit_card', 'mortgage', 'auto_loan', 'student_loan',
+    'home_equity', 'personal_loan', 'business_loan', 'line_of_credit',
+})
+
+# Our investment account types; a zero Plaid balance for these is treated as unavailable
+INVESTMENT_ACCOUNT_TYPES = frozenset({'investment', 'brokerage', 'rrsp', 'tfsa'})
+
+# Account types whose transactions also get expense records (Cashflow section)
+EXPENSE_ACCOUNT_TYPES = frozenset({'checking', 'credit_card'})
+
+# Cash investment transaction subtypes containing any of these are money in
+INVESTMENT_INCOME_KEYWORDS = ('deposit', 'earning', 'income', 'interest', 'dividend', 'refund', 'rebate')
+
+
+def _batch_uuids(count: int) -> list:
+    """
+    Generate ``count`` random UUID4 strings from a single os.urandom call
+
+    Equivalent to calling ``str(uuid.uuid4())`` ``count`` times, without
+    the per-call syscall.
+    """
+    buf = os.urandom(16 * count)
+    return [str(uuid.UUID(bytes=buf[i:i + 16], version=4)) for i in range(0, 16 * count, 16)]
+
+
+def _write_debug_json(path, data: dict):
+    """
+    Write a Plaid debug payload as indented JSON
+
+    orjson serializes the large raw API responses several times faster than
+    the json module; values it cannot encode natively fall back to str().
+    """
+    with open(path, 'wb') as f:
+        f.write(orjson.dumps(data, default=str, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS))
+
+
+def _log_debug_write_error(future):
+    error = future.exception()
+    if error is not None:
+        logger.warning(f"Failed to save debug payload: {error}")
+
+
+def _queue_debug_json(path, data: dict):
+    """
+    Write a Plaid debug payload on the debug writer thread
+
+    Serializing and writing the raw responses can take a while for large syncs,
+    so it is done off the job's thread. The payload must not be modified afterwards.
+    """
+    _DEBUG_WRITER.submit(_write_debug_json, path, data).add_done_callback(_log_debug_write_error)
+
+
+def _wait_for_debug_writes():
+    """Block until every queued debug payload has been written"""
+    # The writer has a single thread, so a no-op completes after everything queued before it
+    _DEBUG_WRITER.submit(lambda: None).result()
+
+
+def _reset_debug_writer():
+    # Executor threads do not survive fork (RQ runs each job in a forked work horse)
+    global _DEBUG_WRITER
+    _DEBUG_WRITER = ThreadPoolExecutor(max_workers=1, thread_name_prefix="plaid-debug")
+
+
+os.register_at_fork(after_in_child=_reset_debug_writer)
+
+
+def _any_of(values):
+    """
+    Right-hand side for ``column == _any_of(values)``, rendered as ``= ANY(:array)``
+
+    All values are bound as a single text[] parameter instead of one placeholder
+    per value, so large id lists do not produce very long statements.
+    """
+    return any_(literal(list(values), ARRAY(String)))
+
+
+def _parse_plaid_date(value: str) -> date:
+    """Parse a Plaid YYYY-MM-DD date string, falling back to strptime for non-ISO input"""
+    try:
+        return date.fromisoformat(value)
+    except ValueError:
+        return datetime.strptime(value, '%Y-%m-%d').date()
+
+
+def _investment_transaction_amount(raw_amount, plaid_type: str, plaid_subtype: str) -> float:
+    """
+    Convert a Plaid investment transaction amount to our sign convention
+
+    Plaid uses positive for debits (buys/withdrawals), negative for credits (sells/deposits);
+    ours is positive = money in, negative = money out. Plaid often sends deposits/earnings
+    with negative amounts, so for cash transactions the subtype is trusted, not the sign:
+    - subtype "deposit" or contains earnings/income keywords → always POSITIVE (money IN)
+    - subtype "withdrawal" → keep as-is or make NEGATIVE (money OUT)
+    - Other types (buy/sell/dividend/interest) → negate the amount
+
+    Args:
+        raw_amount: Amount as sent by Plaid
+        plaid_type: Lowercased Plaid investment transaction type
+        plaid_subtype: Lowercased Plaid investment transaction subtype
+
+    Returns:
+        Signed transaction amount
+    """
+    if plaid_type == 'cash':
+        if any(keyword in plaid_subtype for keyword in INVESTMENT_INCOME_KEYWORDS):
+            return abs(raw_amount)
+        return -abs(raw_amount)
+    return -raw_amount
+
+
+def _running_balances(start: float, amounts: list) -> list:
+    """
+    Return start followed by the running balance after each amount, rounded to cents
+
+    np.cumsum adds the amounts in order, so the balances are identical to a
+    Python += loop while the accumulation runs in a single vectorized pass.
+    """
+    balances = np.fromiter(chain((start,), amounts), dtype=np.float64, count=len(amounts) + 1)
+    return [round(balance, 2) for balance in np.cumsum(balances).tolist()]
+
+
+def _load_transaction_ids_by_plaid_id(db, plaid_transaction_ids: list) -> dict:
+    """
+    Look up the IDs of existing transactions for the given Plaid transaction IDs
+
+    Returns:
+        Mapping of plaid_transaction_id to Transaction.id
+    """
+    if not plaid_transaction_ids:
+        return {}
+    return dict(
+        db.query(Transaction.plaid_transaction_id, Transaction.id)
+        .filter(Transaction.plaid_transaction_id == _any_of(plaid_transaction_ids))
+        .all()
+    )
+
+
+def _bulk_insert(db, model, rows: list):
+    """
+    Insert plain dict rows for ``model`` with a single Core INSERT
+
+    Skips the ORM unit of work; rows are not added to the session identity map.
+    """
+    if rows:
+        db.execute(insert(model.__table__), rows)
+
+
+def _transaction_upsert_statement(update_columns: tuple):
+    """
+    Build the INSERT ... ON CONFLICT (plaid_transaction_id) DO UPDATE used for Transaction rows
+
+    The conflict target repeats the WHERE of the partial unique index from migration 002,
+    which Postgres needs to match it; a plain unique index satisfies the predicate too.
+    """
+    stmt = pg_insert(Transaction.__table__)
+    return stmt.on_conflict_do_update(
+        index_elements=[Transaction.plaid_transaction_id],
+        index_where=Transaction.plaid_transaction_id.isnot(None),
+        set_={column: stmt.excluded[column] for column in update_columns}
+    )
+
+
+def _bulk_upsert_transactions(db, rows: list, update_columns: tuple):
+    """
+    Insert plain dict Transaction rows, updating those whose plaid_transaction_id already exists
+
+    Uses a single upsert statement; existing rows keep their id, account and source and
+    only get ``update_columns`` overwritten.
+    """
+    if rows:
+        db.execute(_transaction_upsert_statement(update_columns), rows)
+
 
 def run_plaid_sync_job(user_id: str, plaid_item_id: str, full_resync: bool = False, replay_mode: bool = False):
     """
@@ -43,13 +253,24 @@ def run_plaid_sync_job(user_id: str, plaid_item_id: str, full_resync: bool = Fal
         Dictionary with sync results
     """
     job = get_current_job()
+    last_saved_stage = None
+    last_meta_save = 0.0
 
     def update_stage(stage: str, progress: dict = None):
+        nonlocal last_saved_stage, last_meta_save
         if job:
             job.meta["stage"] = stage
             if progress:
                 job.meta["progress"] = progress
             job.meta["user_id"] = user_id  # For access control
+
+            # Coalesce rapid progress updates within a stage into fewer Redis writes
+            now = time.monotonic()
+            if stage == last_saved_stage and now - last_meta_save < JOB_META_SAVE_INTERVAL:
+                return
+            last_saved_stage = stage
+            last_meta_save = now
+
             job.save_meta()
             logger.info(f"Plaid sync job {job.id} stage: {stage} progress: {progress}")
 
@@ -85,18 +306,25 @@ def run_plaid_sync_job(user_id: str, plaid_item_id: str, full_resync: bool = Fal
             # Security: Decrypt access token before using
             access_token = encryption_service.decrypt(plaid_item.access_token)
 
+            # Transactions fetched so far when paging through history (full resync only)
+            historical_fetched = None
+
+            # Remaining saved pages when replaying a paginated sync
+            replay_pages = None
+
             # Handle full resync vs incremental sync vs replay
             if replay_mode and replay_data and 'transactions' in replay_data:
                 # REPLAY MODE: Use saved transaction data
                 logger.info(f"[REPLAY] Using saved transaction data instead of calling Plaid API")
 
                 transaction_debug_data = replay_data['transactions']
-                sync_result = plaid_replay.extract_transactions_from_debug_data(transaction_debug_data)
+                replay_pages = plaid_replay.iter_transaction_pages_from_debug_data(transaction_debug_data)
+                sync_result = next(replay_pages)
 
                 logger.info(
                     f"[REPLAY] Extracted {len(sync_result['added'])} added, "
                     f"{len(sync_result['modified'])} modified, "
-                    f"{len(sync_result['removed'])} removed transactions from debug data"
+                    f"{len(sync_result['removed'])} removed transactions from the first page of debug data"
                 )
 
             elif full_resync:
@@ -108,17 +336,21 @@ def run_plaid_sync_job(user_id: str, plaid_item_id: str, full_resync: bool = Fal
                 })
 
                 # Fetch historical transactions (2 years back)
-                end_date = datetime.now().date()
+                end_date = date.today()
                 start_date = end_date - timedelta(days=730)  # 2 years
 
-                logger.info(f"[FULL RESYNC] Date range: {start_date} to {end_date}")
+                start_date_str = start_date.isoformat()
+                end_date_str = end_date.isoformat()
+
+                logger.info(f"[FULL RESYNC] Date range: {start_date_str} to {end_date_str}")
 
-                # Use historical transaction fetch
+                # Use historical transaction fetch; later pages are fetched and processed one
+                # at a time in the loop below instead of holding the whole history in memory
                 historical_result = plaid_client.get_historical_transactions(
                     access_token=access_token,
-                    start_date=start_date.strftime('%Y-%m-%d'),
-                    end_date=end_date.strftime('%Y-%m-%d'),
-                    count=500,
+                    start_date=start_date_str,
+                    end_date=end_date_str,
+                    count=PLAID_MAX_PAGE_SIZE,
                     offset=0
                 )
 
@@ -126,79 +358,14 @@ def run_plaid_sync_job(user_id: str, plaid_item_id: str, full_resync: bool = Fal
                     raise Exception("Failed to fetch historical transactions from Plaid")
 
                 # Collect raw Plaid API responses for debug logging
-                all_raw_responses = [historical_result.get('raw_response', {})]
-
-                # Convert to sync_result format (added transactions)
-                sync_result = {
-                    "added": historical_result.get('transactions', []),
-                    "modified": [],
-                    "removed": [],
-                    "next_cursor": None,  # We'll get a cursor later from sync API
-                    "has_more": len(historical_result.get('transactions', [])) < historical_result.get('total_transactions', 0),
-                }
-
-                # If there are more transactions, fetch them
-                total_fetched = len(sync_result["added"])
-                total_available = historical_result.get('total_transactions', 0)
-
-                while sync_result["has_more"]:
-                    logger.info(f"[FULL RESYNC] Fetching more transactions (offset: {total_fetched}/{total_available})")
-                    update_stage("fetching_historical", {
-                        "message": f"Fetching transaction history... ({total_fetched}/{total_available})",
-                        "current": total_fetched,
-                        "total": total_available
-                    })
-
-                    historical_result = plaid_client.get_historical_transactions(
-                        access_token=access_token,
-                        start_date=start_date.strftime('%Y-%m-%d'),
-                        end_date=end_date.strftime('%Y-%m-%d'),
-                        count=500,
-                        offset=total_fetched
-                    )
-
-                    if not historical_result:
-                        break
-
-                    # Collect raw response from this page
+                all_raw_responses = []
+                if settings.PLAID_DEBUG_MODE:
                     all_raw_responses.append(historical_result.get('raw_response', {}))
 
-                    new_transactions = historical_result.get('transactions', [])
-                    sync_result["added"].extend(new_transactions)
-                    total_fetched = len(sync_result["added"])
-                    sync_result["has_more"] = total_fetched < total_available
-
-                logger.info(f"[FULL RESYNC] Fetched {len(sync_result['added'])} historical transactions")
-
-                # Security: Save Plaid full sync payload for debugging only if debug mode is enabled
-                if settings.PLAID_DEBUG_MODE:
-                    try:
-                        timestamp = datetime.utcnow().strftime("%Y%m%d_%H%M%S")
-                        debug_file = PLAID_DEBUG_DIR / f"full_sync_{user_id}_{plaid_item_id}_{timestamp}.json"
-                        debug_data = {
-                            "timestamp": datetime.utcnow().isoformat(),
-                            "user_id": user_id,
-                            "plaid_item_id": plaid_item_id,
-                            "institution_name": plaid_item.institution_name,
-                            "sync_type": "full_resync",
-                            "date_range": {
-                                "start": start_date.isoformat(),
-                                "end": end_date.isoformat()
-                            },
-                            "pagination_info": {
-                                "total_api_calls": len(all_raw_responses),
-                                "total_transactions_fetched": len(sync_result['added'])
-                            },
-                            "raw_plaid_responses": all_raw_responses  # Save ALL raw Plaid API responses (one per page)
-                        }
-                        with open(debug_file, 'w') as f:
-                            json.dump(debug_data, f, indent=2, default=str)
-                        logger.info(
-                            f"[FULL RESYNC] Saved {len(all_raw_responses)} raw Plaid API responses "
-                            f"({len(sync_result['added'])} total transactions) to {debug_file}"
-                        )
-                    except Exception as debug_error:
-                        logger.warning(f"Failed to save debug payload: {debug_error}")
+                # Convert to sync_result format (added transactions)
+                sync_result = _historical_sync_page(historical_result, offset=0)
+                historical_fetched = len(sync_result['added'])
+                historical_total = historical_result.get('total_transactions', 0)
 
                 # IMPORTANT: For full resync, we DO NOT delete existing Plaid transactions
                 # Instead, we upsert them during processing (update if exists, insert if new)
@@ -222,81 +389,7 @@ def run_plaid_sync_job(user_id: str, plaid_item_id: str, full_resync: bool = Fal
                     "total": 0
                 })
 
-                # Sync transactions from Plaid
-                sync_result = plaid_client.sync_transactions(
-                    access_token=access_token,
-                    cursor=cursor,
-                    count=500
-                )
-
-                if not sync_result:
-                    raise Exception("Failed to sync transactions from Plaid")
-
-                # Check if login is required (credentials expired or changed)
-                if sync_result.get('login_required'):
-                    error_msg = sync_result.get('error_message', 'Login required - please re-link your account')
-                    logger.error(f"[PLAID SYNC] {error_msg}")
-
-                    # Update PlaidItem status
-                    plaid_item.status = "login_required"
-                    plaid_item.error_message = error_msg
-                    db.commit()
-
-                    raise Exception(error_msg)
-
-                # Check if cursor reset is required (transaction data changed during pagination)
-                if sync_result.get('cursor_reset_required'):
-                    logger.warning(f"[PLAID SYNC] Cursor reset required - transaction data changed during pagination")
-                    logger.info(f"[PLAID SYNC] Resetting cursor and retrying sync from the beginning...")
-
-                    # Delete the old cursor to force a fresh sync
-                    sync_cursor = db.query(PlaidSyncCursor).filter(
-                        PlaidSyncCursor.plaid_item_id == plaid_item_id
-                    ).first()
-
-                    if sync_cursor:
-                        db.delete(sync_cursor)
-                        db.commit()
-                        logger.info(f"[PLAID SYNC] Deleted old cursor, will restart from beginning")
-
-                    # Retry the sync with null cursor
-                    sync_result = plaid_client.sync_transactions(
-                        access_token=access_token,
-                        cursor=None,  # Start fresh
-                        count=500
-                    )
-
-                    if not sync_result:
-                        raise Exception("Failed to sync transactions from Plaid after cursor reset")
-
-                    if sync_result.get('cursor_reset_required'):
-                        # If it fails again, give up
-                        raise Exception("Transaction data keeps changing - please try again later")
-
-                # Security: Save Plaid incremental sync payload for debugging only if debug mode is enabled
-                if settings.PLAID_DEBUG_MODE:
-                    try:
-                        timestamp = datetime.utcnow().strftime("%Y%m%d_%H%M%S")
-                        debug_file = PLAID_DEBUG_DIR / f"incremental_sync_{user_id}_{plaid_item_id}_{timestamp}.json"
-                        debug_data = {
-                            "timestamp": datetime.utcnow().isoformat(),
-                            "user_id": user_id,
-                            "plaid_item_id": plaid_item_id,
-                            "institution_name": plaid_item.institution_name,
-                            "sync_type": sync_type,
-                            "had_cursor": cursor is not None,
-                            "raw_plaid_response": sync_result.get('raw_response', {})  # Save raw Plaid API response
-                        }
-                        with open(debug_file, 'w') as f:
-                            json.dump(debug_data, f, indent=2, default=str)
-                        logger.info(
-                            f"[INCREMENTAL SYNC] Saved raw Plaid API response to {debug_file}: "
-                            f"{len(sync_result.get('added', []))} added, "
-                            f"{len(sync_result.get('modified', []))} modified, "
-                            f"{len(sync_result.get('removed', []))} removed"
-                        )
-                    except Exception as debug_error:
-                        logger.warning(f"Failed to save debug payload: {debug_error}")
+                sync_result = _fetch_transactions_page(db, plaid_item, access_token, user_id, cursor)
 
             # Get PlaidAccount mappings
             plaid_accounts = db.query(PlaidAccount).filter(
@@ -308,6 +401,21 @@ def run_plaid_sync_job(user_id: str, plaid_item_id: str, full_resync: bool = Fal
                 for pa in plaid_accounts
             }
 
+            # Linked Account records, loaded once and shared by the steps below
+            accounts_by_id = _load_linked_accounts(db, plaid_accounts, plaid_account_map)
+
+            # Account types for every linked account, looked up per transaction
+            account_type_map = {
+                account_id: account.account_type.value
+                for account_id, account in accounts_by_id.items()
+            }
+
+            # Linked accounts whose transactions also get expense records
+            expense_account_ids = frozenset(
+                account_id for account_id, account_type in account_type_map.items()
+                if account_type in EXPENSE_ACCOUNT_TYPES
+            )
+
             # Create transaction mapper
             mapper = create_mapper(db)
 
@@ -318,128 +426,168 @@ def run_plaid_sync_job(user_id: str, plaid_item_id: str, full_resync: bool = Fal
             duplicate_count = 0
             expense_count = 0
 
-            total_transactions = len(sync_result['added']) + len(sync_result['modified']) + len(sync_result['removed'])
+            # Import sequence of the first transaction on the current page, so historical
+            # pages keep numbering on from the previous page
+            sequence_base = 0
 
-            update_stage("processing", {
-                "message": f"Processing {total_transactions} transactions...",
-                "current": 0,
-                "total": total_transactions,
-                "added": 0,
-                "modified": 0,
-                "removed": 0,
-                "duplicates": 0
-            })
+            # Regular pages processed since the last commit
+            pages_since_commit = 0
 
-            # Process added transactions
-            for idx, plaid_txn in enumerate(sync_result['added'], 1):
-                plaid_account_id = plaid_txn['account_id']
-                account_id = plaid_account_map.get(plaid_account_id)
+            # Process one page of changes per iteration; later pages reuse the account
+            # maps and mapper above instead of restarting the whole job
+            while True:
+                total_added = len(sync_result['added'])
+                total_modified = len(sync_result['modified'])
+                total_removed = len(sync_result['removed'])
+                total_transactions = total_added + total_modified + total_removed
 
-                if not account_id:
-                    logger.warning(f"Account not found for Plaid account {plaid_account_id}")
-                    continue
+                update_stage("processing", {
+                    "message": f"Processing {total_transactions} transactions...",
+                    "current": 0,
+                    "total": total_transactions,
+                    "added": added_count,
+                    "modified": modified_count,
+                    "removed": removed_count,
+                    "duplicates": duplicate_count
+                })
 
-                # Get account details
-                account = db.query(Account).filter(Account.id == account_id).first()
-                if not account:
-                    continue
+                # Pre-allocate IDs for rows that may be created below
+                transaction_ids = _batch_uuids(total_added)
+                expense_ids = _batch_uuids(total_added)
 
-                account_type = account.account_type.value
+                # Transaction rows (new and existing, keyed by Plaid ID) are upserted in bulk after
+                # the loop; new expense rows are inserted in bulk
+                transaction_rows = {}
+                new_expense_rows = []
 
-                # Map to our transaction format
-                txn_data = mapper.map_transaction(plaid_txn, account_id, account_type)
+                # Look up the transactions that already exist in one pass instead of one query per row
+                existing_txn_ids = _load_transaction_ids_by_plaid_id(
+                    db, [plaid_txn['transaction_id'] for plaid_txn in sync_result['added']]
+                )
 
-                # Check if transaction already exists by plaid_transaction_id (upsert logic)
-                existing_txn = db.query(Transaction).filter(
-                    Transaction.plaid_transaction_id == txn_data['plaid_transaction_id']
-                ).first()
+                # Expenses of those transactions, loaded the same way
+                existing_expenses = {}
+                if existing_txn_ids:
+                    existing_expenses = {
+                        expense.transaction_id: expense
+                        for expense in db.query(Expense).filter(
+                            Expense.transaction_id == _any_of(existing_txn_ids.values())
+                        )
+                    }
 
-                if existing_txn:
-                    # Update existing transaction
-                    existing_txn.date = txn_data['date']
-                    existing_txn.type = txn_data['type']
-                    existing_txn.total = txn_data['total']
-                    existing_txn.description = txn_data.get('description')
-                    existing_txn.pfc_primary = txn_data.get('pfc_primary')
-                    existing_txn.pfc_detailed = txn_data.get('pfc_detailed')
-                    existing_txn.pfc_confidence = txn_data.get('pfc_confidence')
-                    existing_txn.import_sequence = idx
-                    transaction = existing_txn
-                    modified_count += 1
-                    logger.debug(f"Updated existing transaction: {plaid_txn['transaction_id']}")
-                else:
+                # Plaid IDs created in this sync, so a repeat within the payload is not inserted twice
+                created_plaid_ids = set()
+
+                # Bound once so the loops below don't repeat the attribute lookups per row
+                map_transaction = mapper.map_transaction
+                map_to_expense = mapper.map_to_expense
+                get_existing_expense = existing_expenses.get
+
+                # Process added transactions
+                for idx, plaid_txn in enumerate(sync_result['added'], 1):
+                    account_id = plaid_account_map.get(plaid_txn['account_id'])
+                    if not account_id:
+                        logger.warning(f"Account not found for Plaid account {plaid_txn['account_id']}")
+                        continue
+
+                    # Get account details
+                    account_type = account_type_map.get(account_id)
+                    if not account_type:
+                        continue
+
+                    if plaid_txn['transaction_id'] in created_plaid_ids:
+                        duplicate_count += 1
+                        logger.debug("Skipping duplicate transaction in payload: %s", plaid_txn['transaction_id'])
+                        continue
+
+                    # Map Plaid transaction to our format
+                    txn_data = map_transaction(plaid_txn, account_id, account_type)
+
+                    # Check if transaction already exists by plaid_transaction_id (upsert logic)
                     # No duplicate detection - use upsert with plaid_transaction_id as unique key
                     # Cleanup overlapping logic will handle removing non-Plaid duplicates
+                    existing_txn_id = existing_txn_ids.get(txn_data['plaid_transaction_id'])
+                    transaction_id = existing_txn_id or transaction_ids[idx - 1]
+
+                    # Existing transactions are updated by the same statement that creates new ones
+                    # (a later entry for the same Plaid ID replaces an earlier one)
+                    transaction_rows[txn_data['plaid_transaction_id']] = {
+                        "id": transaction_id,
+                        "account_id": account_id,
+                        "date": txn_data['date'],
+                        "type": txn_data['type'],
+                        "total": txn_data['total'],
+                        "description": txn_data['description'],
+                        "source": txn_data['source'],
+                        "plaid_transaction_id": txn_data['plaid_transaction_id'],
+                        "pfc_primary": txn_data['pfc_primary'],
+                        "pfc_detailed": txn_data['pfc_detailed'],
+                        "pfc_confidence": txn_data['pfc_confidence'],
+                        "import_sequence": sequence_base + idx  # Preserve order from Plaid API
+                    }
+
+                    if existing_txn_id:
+                        modified_count += 1
+                        logger.debug("Updated existing transaction: %s", plaid_txn['transaction_id'])
+                    else:
+                        created_plaid_ids.add(txn_data['plaid_transaction_id'])
+                        added_count += 1
+                        logger.debug("Created new transaction: %s", plaid_txn['transaction_id'])
+
+                    # Create or update expense records only for checking and credit card accounts
+                    # These appear in the Cashflow section for expense/income tracking
+                    if account_id in expense_account_ids:
+                        expense_data = map_to_expense(
+                            plaid_txn,
+                            account_id,
+                            transaction_id,
+                            txn_data['type'],  # Pass transaction type
+                            transaction_data=txn_data
+                        )
 
-                    # Create new transaction
-                    transaction = Transaction(
-                        id=str(uuid.uuid4()),
-                        account_id=account_id,
-                        date=txn_data['date'],
-                        type=txn_data['type'],
-                        total=txn_data['total'],
-                        description=txn_data.get('description'),
-                        source=txn_data['source'],
-                        plaid_transaction_id=txn_data['plaid_transaction_id'],
-                        pfc_primary=txn_data.get('pfc_primary'),
-                        pfc_detailed=txn_data.get('pfc_detailed'),
-                        pfc_confidence=txn_data.get('pfc_confidence'),
-                        import_sequence=idx  # Preserve order from Plaid API
-                    )
-                    db.add(transaction)
-                    added_count += 1
-                    logger.debug(f"Created new transaction: {plaid_txn['transaction_id']}")
-
-                # Create or update expense records only for checking and credit card accounts
-                # These appear in the Cashflow section for expense/income tracking
-                expense_account_types = ['checking', 'credit_card']
-                if account_type in expense_account_types:
-                    expense_data = mapper.map_to_expense(
-                        plaid_txn,
-                        account_id,
-                        transaction.id,
-                        txn_data['type']  # Pass transaction type
-                    )
-
-                    if expense_data:
-                        # Check if expense already exists for this transaction
-                        existing_expense = db.query(Expense).filter(
-                            Expense.transaction_id == transaction.id
-                        ).first()
-
-                        if existing_expense:
-                            # Update existing expense
-                            existing_expense.date = expense_data['date']
-                            existing_expense.type = expense_data['type']
-                            existing_expense.description = expense_data['description']
-                            existing_expense.amount = expense_data['amount']
-                            # Don't overwrite category if user has manually set it
-                            if not existing_expense.category or existing_expense.category == 'Uncategorized':
-                                existing_expense.category = expense_data.get('category')
-                            existing_expense.pfc_primary = expense_data.get('pfc_primary')
-                            existing_expense.pfc_detailed = expense_data.get('pfc_detailed')
-                            existing_expense.pfc_confidence = expense_data.get('pfc_confidence')
-                        else:
-                            # Create new expense
-                            expense = Expense(
-                                id=str(uuid.uuid4()),
-                                account_id=account_id,
-                                transaction_id=transaction.id,
-                                date=expense_data['date'],
-                                type=expense_data['type'],  # Store transaction type
-                                description=expense_data['description'],
-                                amount=expense_data['amount'],
-                                category=expense_data.get('category'),
-                                notes=None,
-                                pfc_primary=expense_data.get('pfc_primary'),
-                                pfc_detailed=expense_data.get('pfc_detailed'),
-                                pfc_confidence=expense_data.get('pfc_confidence')
-                            )
-                            db.add(expense)
-                            expense_count += 1
+                        if expense_data:
+                            # Check if expense already exists for this transaction
+                            # (a transaction created in this sync cannot have one yet)
+                            existing_expense = get_existing_expense(transaction_id)
+
+                            if existing_expense:
+                                # Update existing expense
+                                existing_expense.date = expense_data['date']
+                                existing_expense.type = expense_data['type']
+                                existing_expense.description = expense_data['description']
+                                existing_expense.amount = expense_data['amount']
+                                # Don't overwrite category if user has manually set it
+                                if not existing_expense.category or existing_expense.category == 'Uncategorized':
+                                    existing_expense.category = expense_data['category']
+                                existing_expense.pfc_primary = expense_data['pfc_primary']
+                                existing_expense.pfc_detailed = expense_data['pfc_detailed']
+                                existing_expense.pfc_confidence = expense_data['pfc_confidence']
+                            else:
+                                # Create new expense
+                                new_expense_rows.append({
+                                    "id": expense_ids[idx - 1],
+                                    "account_id": account_id,
+                                    "transaction_id": transaction_id,
+                                    "date": expense_data['date'],
+                                    "type": expense_data['type'],  # Store transaction type
+                                    "description": expense_data['description'],
+                                    "amount": expense_data['amount'],
+                                    "category": expense_data['category'],
+                                    "notes": None,
+                                    "pfc_primary": expense_data['pfc_primary'],
+                                    "pfc_detailed": expense_data['pfc_detailed'],
+                                    "pfc_confidence": expense_data['pfc_confidence']
+                                })
+                                expense_count += 1
+
+                    # Write accumulated rows in batches to bound memory on large resyncs
+                    # (transactions first so the expense foreign keys resolve)
+                    if len(transaction_rows) >= BULK_INSERT_BATCH_SIZE:
+                        _bulk_upsert_transactions(db, list(transaction_rows.values()), PLAID_TRANSACTION_UPDATE_COLUMNS)
+                        _bulk_insert(db, Expense, new_expense_rows)
+                        transaction_rows.clear()
+                        new_expense_rows.clear()
 
-                # Update progress every 10 transactions or at milestones
-                if idx % 10 == 0 or idx == len(sync_result['added']):
                     update_stage("processing", {
                         "message": f"Processing transactions ({idx + modified_count}/{total_transactions})...",
                         "current": idx + modified_count,
@@ -450,42 +598,57 @@ def run_plaid_sync_job(user_id: str, plaid_item_id: str, full_resync: bool = Fal
                         "duplicates": duplicate_count
                     })
 
-            # Process modified transactions
-            for idx, plaid_txn in enumerate(sync_result['modified'], 1):
-                # Find existing transaction by Plaid ID
-                existing_txn = db.query(Transaction).filter(
-                    Transaction.plaid_transaction_id == plaid_txn['transaction_id']
-                ).first()
+                # Transactions first so the expense foreign keys resolve
+                _bulk_upsert_transactions(db, list(transaction_rows.values()), PLAID_TRANSACTION_UPDATE_COLUMNS)
+                _bulk_insert(db, Expense, new_expense_rows)
+
+                # Resolve the primary keys of the modified transactions in one query
+                modified_txn_ids = {}
+                if total_modified:
+                    modified_txn_ids = dict(
+                        db.query(Transaction.plaid_transaction_id, Transaction.id)
+                        .filter(Transaction.plaid_transaction_id == _any_of(
+                            plaid_txn['transaction_id'] for plaid_txn in sync_result['modified']
+                        ))
+                        .all()
+                    )
+                modified_updates = []
 
-                if existing_txn:
-                    plaid_account_id = plaid_txn['account_id']
-                    account_id = plaid_account_map.get(plaid_account_id)
+                # Process modified transactions
+                for idx, plaid_txn in enumerate(sync_result['modified'], 1):
+                    # Find existing transaction by Plaid ID
+                    existing_txn_id = modified_txn_ids.get(plaid_txn['transaction_id'])
 
-                    if not account_id:
-                        continue
+                    if existing_txn_id:
+                        plaid_account_id = plaid_txn['account_id']
+                        account_id = plaid_account_map.get(plaid_account_id)
 
-                    account = db.query(Account).filter(Account.id == account_id).first()
-                    if not account:
-                        continue
+                        if not account_id:
+                            continue
 
-                    # Map updated transaction
-                    txn_data = mapper.map_transaction(
-                        plaid_txn,
-                        account_id,
-                        account.account_type.value
-                    )
+                        account_type = account_type_map.get(account_id)
+                        if not account_type:
+                            continue
+
+                        # Map updated transaction
+                        txn_data = map_transaction(
+                            plaid_txn,
+                            account_id,
+                            account_type
+                        )
 
-                    # Update transaction fields
-                    existing_txn.date = txn_data['date']
-                    existing_txn.type = txn_data['type']
-                    existing_txn.total = txn_data['total']
-                    existing_txn.description = txn_data.get('description')
+                        # Update transaction fields
+                        modified_updates.append({
+                            "id": existing_txn_id,
+                            "date": txn_data['date'],
+                            "type": txn_data['type'],
+                            "total": txn_data['total'],
+                            "description": txn_data['description']
+                        })
 
-                    modified_count += 1
+                        modified_count += 1
 
-                # Update progress every 10 transactions
-                if idx % 10 == 0 or idx == len(sync_result['modified']):
-                    current = len(sync_result['added']) + idx
+                    current = total_added + idx
                     update_stage("processing", {
                         "message": f"Processing transactions ({current}/{total_transactions})...",
                         "current": current,
@@ -496,28 +659,30 @@ def run_plaid_sync_job(user_id: str, plaid_item_id: str, full_resync: bool = Fal
                         "duplicates": duplicate_count
                     })
 
-            # Process removed transactions
-            for idx, removed in enumerate(sync_result['removed'], 1):
-                plaid_txn_id = removed['transaction_id']
+                if modified_updates:
+                    # Flush pending ORM changes first so they cannot overwrite the bulk update
+                    db.flush()
+                    db.bulk_update_mappings(Transaction, modified_updates)
 
-                # Find and delete transaction
-                existing_txn = db.query(Transaction).filter(
-                    Transaction.plaid_transaction_id == plaid_txn_id
-                ).first()
+                # Process removed transactions
+                if total_removed:
+                    # Flush pending ORM changes first so none of them target a deleted row
+                    db.flush()
 
-                if existing_txn:
-                    # Delete associated expense if exists
-                    db.query(Expense).filter(
-                        Expense.transaction_id == existing_txn.id
-                    ).delete()
+                    removed_plaid_ids = [removed['transaction_id'] for removed in sync_result['removed']]
+                    removed_txn_ids = db.query(Transaction.id).filter(
+                        Transaction.plaid_transaction_id == _any_of(removed_plaid_ids)
+                    )
 
-                    # Delete transaction
-                    db.delete(existing_txn)
-                    removed_count += 1
+                    # Delete associated expenses, then the transactions themselves
+                    db.query(Expense).filter(
+                        Expense.transaction_id.in_(removed_txn_ids)
+                    ).delete(synchronize_session=False)
+                    removed_count += db.query(Transaction).filter(
+                        Transaction.plaid_transaction_id == _any_of(removed_plaid_ids)
+                    ).delete(synchronize_session=False)
 
-                # Update progress every 10 transactions
-                if idx % 10 == 0 or idx == len(sync_result['removed']):
-                    current = len(sync_result['added']) + len(sync_result['modified']) + idx
+                    current = total_added + total_modified + total_removed
                     update_stage("processing", {
                         "message": f"Processing transactions ({current}/{total_transactions})...",
                         "current": current,
@@ -528,72 +693,169 @@ def run_plaid_sync_job(user_id: str, plaid_item_id: str, full_resync: bool = Fal
                         "duplicates": duplicate_count
                     })
 
-            # Update or create cursor
-            update_stage("finalizing", {
-                "message": "Saving sync state...",
-                "current": total_transactions,
-                "total": total_transactions
-            })
+                if replay_pages is not None and sync_result['has_more']:
+                    # Continue with the next saved page, numbering its transactions after this one's
+                    next_page = next(replay_pages, None)
+                    if next_page is not None:
+                        sequence_base += total_added
+                        sync_result = next_page
+                        continue
 
-            # For full resync, establish a new cursor from current state
-            if full_resync:
-                logger.info(f"[FULL RESYNC] Establishing new sync cursor")
-                # Call sync API once without cursor to establish new cursor position
-                fresh_sync = plaid_client.sync_transactions(
-                    access_token=access_token,
-                    cursor=None,  # No cursor = establish new one
-                    count=1  # Just need the cursor, not more transactions
-                )
+                if historical_fetched is not None and sync_result['has_more']:
+                    # Fetch the next historical page; the sync cursor is established after the last one
+                    logger.info(f"[FULL RESYNC] Fetching more transactions (offset: {historical_fetched}/{historical_total})")
+                    update_stage("fetching_historical", {
+                        "message": f"Fetching transaction history... ({historical_fetched}/{historical_total})",
+                        "current": historical_fetched,
+                        "total": historical_total
+                    })
 
-                if fresh_sync and fresh_sync.get('next_cursor'):
-                    next_cursor = fresh_sync['next_cursor']
-                    logger.info(f"[FULL RESYNC] New cursor established: {next_cursor[:50]}...")
+                    historical_result = plaid_client.get_historical_transactions(
+                        access_token=access_token,
+                        start_date=start_date_str,
+                        end_date=end_date_str,
+                        count=PLAID_MAX_PAGE_SIZE,
+                        offset=historical_fetched
+                    )
+
+                    if historical_result:
+                        if settings.PLAID_DEBUG_MODE:
+                            all_raw_responses.append(historical_result.get('raw_response', {}))
+
+                        sync_result = _historical_sync_page(historical_result, offset=historical_fetched)
+                        sequence_base = historical_fetched
+                        historical_fetched += len(sync_result['added'])
+                        continue
+
+                    sync_result['has_more'] = False
+
+                # Update or create cursor
+                update_stage("finalizing", {
+                    "message": "Saving sync state...",
+                    "current": total_transactions,
+                    "total": total_transactions
+                })
+
+                # For full resync, establish a new cursor from current state
+                if full_resync:
+                    logger.info(f"[FULL RESYNC] Establishing new sync cursor")
+                    # Call sync API once without cursor to establish new cursor position,
+                    # flushing this page's changes while the request is in flight
+                    with ThreadPoolExecutor(max_workers=1) as executor:
+                        fresh_sync_future = executor.submit(
+                            plaid_client.sync_transactions,
+                            access_token=access_token,
+                            cursor=None,  # No cursor = establish new one
+                            count=1  # Just need the cursor, not more transactions
+                        )
+                        db.flush()
+                        fresh_sync = fresh_sync_future.result()
+
+                    if fresh_sync and fresh_sync.get('next_cursor'):
+                        next_cursor = fresh_sync['next_cursor']
+                        logger.info(f"[FULL RESYNC] New cursor established: {next_cursor[:50]}...")
+                    else:
+                        logger.warning("[FULL RESYNC] Failed to establish new cursor, will use incremental sync next time")
+                        next_cursor = None
                 else:
-                    logger.warning("[FULL RESYNC] Failed to establish new cursor, will use incremental sync next time")
-                    next_cursor = None
-            else:
-                next_cursor = sync_result['next_cursor']
+                    next_cursor = sync_result['next_cursor']
 
-            # Re-fetch cursor_record in case it was deleted during full resync
-            cursor_record = db.query(PlaidSyncCursor).filter(
-                PlaidSyncCursor.plaid_item_id == plaid_item_id
-            ).first()
+                # Re-fetch cursor_record in case it was deleted during full resync
+                cursor_record = db.query(PlaidSyncCursor).filter(
+                    PlaidSyncCursor.plaid_item_id == plaid_item_id
+                ).first()
 
-            if next_cursor:
-                if cursor_record:
-                    cursor_record.cursor = next_cursor
-                    cursor_record.last_sync = datetime.utcnow()
+                # One timestamp for the cursor and the item, as both record this page's sync
+                synced_at = datetime.utcnow()
+
+                if next_cursor:
+                    if cursor_record:
+                        cursor_record.cursor = next_cursor
+                        cursor_record.last_sync = synced_at
+                    else:
+                        new_cursor = PlaidSyncCursor(
+                            id=str(uuid.uuid4()),
+                            plaid_item_id=plaid_item_id,
+                            cursor=next_cursor,
+                            last_sync=synced_at
+                        )
+                        db.add(new_cursor)
                 else:
-                    new_cursor = PlaidSyncCursor(
-                        id=str(uuid.uuid4()),
-                        plaid_item_id=plaid_item_id,
-                        cursor=next_cursor,
-                        last_sync=datetime.utcnow()
-                    )
-                    db.add(new_cursor)
-            else:
-                logger.warning("No cursor to save - this may cause issues on next sync")
+                    logger.warning("No cursor to save - this may cause issues on next sync")
 
-            # Update PlaidItem last_synced
-            plaid_item.last_synced = datetime.utcnow()
-            plaid_item.status = "active"
-            plaid_item.error_message = None
+                # Update PlaidItem last_synced
+                plaid_item.last_synced = synced_at
+                plaid_item.status = "active"
+                plaid_item.error_message = None
 
-            # Commit regular transaction changes
-            db.commit()
+                # Check if there are more regular transactions to fetch
+                has_more = sync_result.get('has_more', False)
+
+                # Commit every TRANSACTION_PAGES_PER_COMMIT pages and after the last one; each
+                # commit carries the cursor of its last page, so a failed batch is fetched again
+                pages_since_commit += 1
+                if not has_more or pages_since_commit >= TRANSACTION_PAGES_PER_COMMIT:
+                    db.commit()
+                    pages_since_commit = 0
+                else:
+                    # The next page's lookups need this page's rows
+                    db.flush()
+
+                if not has_more:
+                    break
 
-            # Check if there are more regular transactions to fetch
-            has_more = sync_result.get('has_more', False)
-            if has_more:
                 update_stage("fetching", {
                     "message": "Fetching additional transactions...",
                     "current": total_transactions,
                     "total": total_transactions
                 })
                 logger.info(f"More transactions available for item {plaid_item_id}, continuing sync...")
-                # Recursively call to get more transactions
-                # In production, you might want to limit recursion depth
-                return run_plaid_sync_job(user_id, plaid_item_id)
+                sync_result = _fetch_transactions_page(db, plaid_item, access_token, user_id, next_cursor)
+
+            if historical_fetched is not None:
+                logger.info(f"[FULL RESYNC] Processed {historical_fetched} historical transactions")
+
+                # Security: Save Plaid full sync payload for debugging only if debug mode is enabled
+                if settings.PLAID_DEBUG_MODE:
+                    try:
+                        saved_at = datetime.utcnow()
+                        timestamp = saved_at.strftime("%Y%m%d_%H%M%S")
+                        debug_file = PLAID_DEBUG_DIR / f"full_sync_{user_id}_{plaid_item_id}_{timestamp}.json"
+                        debug_data = {
+                            "timestamp": saved_at.isoformat(),
+                            "user_id": user_id,
+                            "plaid_item_id": plaid_item_id,
+                            "institution_name": plaid_item.institution_name,
+                            "sync_type": "full_resync",
+                            "date_range": {
+                                "start": start_date_str,
+                                "end": end_date_str
+                            },
+                            "pagination_info": {
+                                "total_api_calls": len(all_raw_responses),
+                                "total_transactions_fetched": historical_fetched
+                            },
+                            "raw_plaid_responses": all_raw_responses  # Save ALL raw Plaid API responses (one per page)
+                        }
+                        _queue_debug_json(debug_file, debug_data)
+                        logger.info(
+                            f"[FULL RESYNC] Saving {len(all_raw_responses)} raw Plaid API responses "
+                            f"({historical_fetched} total transactions) to {debug_file}"
+                        )
+                    except Exception as debug_error:
+                        logger.warning(f"Failed to save debug payload: {debug_error}")
+
+            # Fetch investment holdings once and reuse for multiple operations
+            # This avoids making 3 separate API calls to Plaid
+            # In replay mode, use saved data instead
+            # Fetched before the investment writes, so no Plaid call runs while they are uncommitted
+            if replay_mode and replay_data and 'holdings' in replay_data:
+                logger.info("[REPLAY] Using saved holdings data instead of calling Plaid API")
+                holdings_debug_data = replay_data['holdings']
+                holdings_data = plaid_replay.extract_holdings_from_debug_data(holdings_debug_data)
+            else:
+                logger.info("[HOLDINGS] Fetching investment holdings data (will be reused for sync, validation, and balance updates)")
+                holdings_data = plaid_client.get_investment_holdings(access_token)
 
             # Sync investment transactions for investment accounts
             update_stage("fetching_investments", {
@@ -610,6 +872,7 @@ def run_plaid_sync_job(user_id: str, plaid_item_id: str, full_resync: bool = Fal
             investment_added = _sync_investment_transactions(
                 db=db,
                 plaid_item=plaid_item,
+                access_token=access_token,
                 plaid_accounts=plaid_accounts,
                 plaid_account_map=plaid_account_map,
                 mapper=mapper,
@@ -618,23 +881,11 @@ def run_plaid_sync_job(user_id: str, plaid_item_id: str, full_resync: bool = Fal
                 replay_data=investment_replay_data
             )
 
-            # Commit investment transaction changes
-            db.commit()
+            # Flush investment transaction changes; they are committed with the holdings
+            db.flush()
 
             added_count += investment_added
 
-            # Fetch investment holdings once and reuse for multiple operations
-            # This avoids making 3 separate API calls to Plaid
-            # In replay mode, use saved data instead
-            if replay_mode and replay_data and 'holdings' in replay_data:
-                logger.info("[REPLAY] Using saved holdings data instead of calling Plaid API")
-                holdings_debug_data = replay_data['holdings']
-                holdings_data = plaid_replay.extract_holdings_from_debug_data(holdings_debug_data)
-            else:
-                logger.info("[HOLDINGS] Fetching investment holdings data (will be reused for sync, validation, and balance updates)")
-                access_token = encryption_service.decrypt(plaid_item.access_token)
-                holdings_data = plaid_client.get_investment_holdings(access_token)
-
             # Sync investment holdings/positions for investment accounts
             update_stage("syncing_holdings", {
                 "message": "Syncing investment positions...",
@@ -645,13 +896,15 @@ def run_plaid_sync_job(user_id: str, plaid_item_id: str, full_resync: bool = Fal
             holdings_synced = _sync_investment_holdings(
                 db=db,
                 plaid_item=plaid_item,
+                access_token=access_token,
                 plaid_accounts=plaid_accounts,
                 plaid_account_map=plaid_account_map,
                 update_stage=update_stage,
                 holdings_data=holdings_data  # Pass pre-fetched data
             )
 
-            # Commit holdings changes
+            # Commit investment transactions and holdings together, so the balance steps
+            # below cannot lose them
             db.commit()
 
             logger.info(f"Synced {holdings_synced} investment holdings")
@@ -663,12 +916,21 @@ def run_plaid_sync_job(user_id: str, plaid_item_id: str, full_resync: bool = Fal
                 "total": len(plaid_accounts)
             })
 
+            # The balance and cleanup steps below each run in a savepoint and log their
+            # errors, so a failure there leaves the committed sync data in place
+
+            # Fetch current account balances from Plaid once for the balance update,
+            # skipping the API call when no Plaid account is linked to one of ours
+            plaid_balances = None
+            if accounts_by_id:
+                plaid_balances = _fetch_plaid_balances(access_token)
+
             _update_opening_balances(
                 db=db,
-                plaid_item=plaid_item,
                 plaid_accounts=plaid_accounts,
                 plaid_account_map=plaid_account_map,
-                holdings_data=holdings_data  # Pass pre-fetched data
+                accounts_by_id=accounts_by_id,
+                plaid_balances=plaid_balances
             )
 
             # Update first Plaid transaction date for accounts
@@ -676,15 +938,21 @@ def run_plaid_sync_job(user_id: str, plaid_item_id: str, full_resync: bool = Fal
             _update_first_plaid_transaction_date(
                 db=db,
                 plaid_accounts=plaid_accounts,
-                plaid_account_map=plaid_account_map
+                plaid_account_map=plaid_account_map,
+                accounts_by_id=accounts_by_id
             )
 
+            # Persist the balance and first-date updates before the cleanup's bulk deletes;
+            # the expire_all() below would otherwise discard them
+            db.flush()
+
             # Clean up overlapping non-Plaid transactions after updating first Plaid transaction date
             # This ensures Plaid data takes precedence over statement imports for the covered period
             _cleanup_overlapping_transactions(
                 db=db,
                 plaid_accounts=plaid_accounts,
-                plaid_account_map=plaid_account_map
+                plaid_account_map=plaid_account_map,
+                accounts_by_id=accounts_by_id
             )
 
             # Expire all objects in session to prevent StaleDataError
@@ -745,14 +1013,143 @@ def run_plaid_sync_job(user_id: str, plaid_item_id: str, full_resync: bool = Fal
 
         raise exc
 
+    finally:
+        # Don't let the job finish (and the work horse exit) with debug payloads unwritten
+        if settings.PLAID_DEBUG_MODE:
+            _wait_for_debug_writes()
+
+
+def _historical_sync_page(historical_result: dict, offset: int) -> dict:
+    """
+    Shape one page of get_historical_transactions like a sync_transactions result
+
+    Args:
+        historical_result: Page returned by plaid_client.get_historical_transactions
+        offset: Number of transactions fetched before this page
+
+    Returns:
+        Dictionary with added/modified/removed lists and has_more
+    """
+    transactions = historical_result.get('transactions', [])
+    return {
+        "added": transactions,
+        "modified": [],
+        "removed": [],
+        "next_cursor": None,  # We'll get a cursor later from sync API
+        "has_more": bool(transactions) and offset + len(transactions) < historical_result.get('total_transactions', 0),
+    }
+
 
-def _sync_investment_transactions(db, plaid_item, plaid_accounts, plaid_account_map, mapper, update_stage, full_resync=False, replay_data=None):
+def _fetch_transactions_page(db, plaid_item, access_token, user_id, cursor):
+    """
+    Fetch one page of transaction changes from Plaid's cursor-based sync API
+
+    Handles expired credentials and cursor resets, and saves the raw response
+    when debug mode is enabled.
+
+    Args:
+        db: Database session
+        plaid_item: PlaidItem record
+        access_token: Decrypted Plaid access token for the item
+        user_id: User ID
+        cursor: Sync cursor to continue from (None for the initial sync)
+
+    Returns:
+        Result of plaid_client.sync_transactions for the page
+    """
+    plaid_item_id = plaid_item.id
+    sync_type = "incremental" if cursor else "initial"
+
+    # Sync transactions from Plaid, restarting from the beginning once if Plaid asks for a cursor reset
+    request_cursor = cursor
+    for attempt in range(2):
+        sync_result = plaid_client.sync_transactions(
+            access_token=access_token,
+            cursor=request_cursor,
+            count=PLAID_MAX_PAGE_SIZE
+        )
+
+        if not sync_result:
+            if attempt:
+                raise Exception("Failed to sync transactions from Plaid after cursor reset")
+            raise Exception("Failed to sync transactions from Plaid")
+
+        # Check if login is required (credentials expired or changed)
+        if sync_result.get('login_required'):
+            error_msg = sync_result.get('error_message', 'Login required - please re-link your account')
+            logger.error(f"[PLAID SYNC] {error_msg}")
+
+            # Update PlaidItem status
+            plaid_item.status = "login_required"
+            plaid_item.error_message = error_msg
+            db.commit()
+
+            raise Exception(error_msg)
+
+        if not sync_result.get('cursor_reset_required'):
+            break
+
+        if attempt:
+            # If it fails again, give up
+            raise Exception("Transaction data keeps changing - please try again later")
+
+        # Cursor reset is required (transaction data changed during pagination)
+        logger.warning(f"[PLAID SYNC] Cursor reset required - transaction data changed during pagination")
+        logger.info(f"[PLAID SYNC] Resetting cursor and retrying sync from the beginning...")
+
+        # Delete the old cursor to force a fresh sync
+        sync_cursor = db.query(PlaidSyncCursor).filter(
+            PlaidSyncCursor.plaid_item_id == plaid_item_id
+        ).first()
+
+        if sync_cursor:
+            db.delete(sync_cursor)
+            db.commit()
+            logger.info(f"[PLAID SYNC] Deleted old cursor, will restart from beginning")
+
+        # Retry the sync with null cursor
+        request_cursor = None
+
+    # Security: Save Plaid incremental sync payload for debugging only if debug mode is enabled
+    if settings.PLAID_DEBUG_MODE:
+        try:
+            saved_at = datetime.utcnow()
+            timestamp = saved_at.strftime("%Y%m%d_%H%M%S")
+            debug_file = PLAID_DEBUG_DIR / f"incremental_sync_{user_id}_{plaid_item_id}_{timestamp}.json"
+            debug_data = {
+                "timestamp": saved_at.isoformat(),
+                "user_id": user_id,
+                "plaid_item_id": plaid_item_id,
+                "institution_name": plaid_item.institution_name,
+                "sync_type": sync_type,
+                "had_cursor": cursor is not None,
+                "raw_plaid_response": sync_result.get('raw_response', {})  # Save raw Plaid API response
+            }
+            _queue_debug_json(debug_file, debug_data)
+            logger.info(
+                f"[INCREMENTAL SYNC] Saving raw Plaid API response to {debug_file}: "
+                f"{len(sync_result.get('added', []))} added, "
+                f"{len(sync_result.get('modified', []))} modified, "
+                f"{len(sync_result.get('removed', []))} removed"
+            )
+        except Exception as debug_error:
+            logger.warning(f"Failed to save debug payload: {debug_error}")
+
+    return sync_result
+
+
+def _sync_investment_transactions(db, plaid_item, access_token, plaid_accounts, plaid_account_map, mapper, update_stage, full_resync=False, replay_data=None):
     """
     Sync investment transactions for investment accounts
 
+    Runs inside the caller's session transaction and never commits: new transactions
+    and dividends are written with bulk INSERTs, and the sync job commits them
+    together with the holdings.
+
     Args:
         db: Database session
         plaid_item: PlaidItem record
+        access_token: Decrypted Plaid access token for the item
         plaid_accounts: List of PlaidAccount records
         plaid_account_map: Mapping of plaid_account_id to account_id
         mapper: Transaction mapper
@@ -809,7 +1206,7 @@ def _sync_investment_transactions(db, plaid_item, plaid_accounts, plaid_account_
         # NORMAL MODE: Fetch from Plaid API
         # For full resync: fetch 2 years of history (matching regular transaction behavior)
         # For incremental: fetch last 90 days to avoid API timeouts
-        end_date = datetime.now().date()
+        end_date = date.today()
         if full_resync:
             start_date = end_date - timedelta(days=730)  # 2 years for full resync
             logger.info(f"[INVESTMENT SYNC] Full resync mode - fetching 2 years of investment transactions")
@@ -817,22 +1214,19 @@ def _sync_investment_transactions(db, plaid_item, plaid_accounts, plaid_account_
             start_date = end_date - timedelta(days=90)  # 90 days for incremental sync
             logger.info(f"[INVESTMENT SYNC] Incremental mode - fetching 90 days of investment transactions")
 
-        start_date_str = start_date.strftime('%Y-%m-%d')
-        end_date_str = end_date.strftime('%Y-%m-%d')
+        start_date_str = start_date.isoformat()
+        end_date_str = end_date.isoformat()
 
         logger.info(f"[INVESTMENT SYNC DEBUG] Fetching investment transactions from {start_date_str} to {end_date_str}")
         logger.info(f"[INVESTMENT SYNC] Calling plaid_client.get_investment_transactions()...")
 
         # Fetch investment transactions with pagination
-        # Security: Decrypt access token before using
-        access_token = encryption_service.decrypt(plaid_item.access_token)
-
         # Fetch first batch
         investment_result = plaid_client.get_investment_transactions(
             access_token=access_token,
             start_date=start_date_str,
             end_date=end_date_str,
-            count=500,
+            count=PLAID_MAX_PAGE_SIZE,
             offset=0
         )
 
@@ -851,42 +1245,75 @@ def _sync_investment_transactions(db, plaid_item, plaid_accounts, plaid_account_
         total_available = investment_result.get('total_transactions', 0)
 
         # Collect raw Plaid API responses for debug logging
-        all_raw_responses = [investment_result.get('raw_response', {})]
-
-        # Fetch remaining pages if there are more transactions
-        total_fetched = len(all_transactions)
+        all_raw_responses = []
+        if settings.PLAID_DEBUG_MODE:
+            all_raw_responses.append(investment_result.get('raw_response', {}))
 
-        while total_fetched < total_available:
-            logger.info(f"[INVESTMENT SYNC] Fetching more investment transactions (offset: {total_fetched}/{total_available})")
+        # Fetch remaining pages if there are more transactions. Offsets are known
+        # up front from total_transactions, so the pages are requested concurrently
+        # and merged back in offset order.
+        remaining_offsets = list(range(len(all_transactions), total_available, PLAID_MAX_PAGE_SIZE))
 
-            investment_result = plaid_client.get_investment_transactions(
-                access_token=access_token,
-                start_date=start_date_str,
-                end_date=end_date_str,
-                count=500,
-                offset=total_fetched
+        if remaining_offsets:
+            logger.info(
+                f"[INVESTMENT SYNC] Fetching {len(remaining_offsets)} more pages of investment transactions "
+                f"({len(all_transactions)}/{total_available} fetched)"
             )
 
-            if not investment_result:
-                logger.warning(f"[INVESTMENT SYNC] Failed to fetch page at offset {total_fetched}, stopping pagination")
-                break
+            def fetch_page(offset):
+                return plaid_client.get_investment_transactions(
+                    access_token=access_token,
+                    start_date=start_date_str,
+                    end_date=end_date_str,
+                    count=PLAID_MAX_PAGE_SIZE,
+                    offset=offset
+                )
 
-            new_transactions = investment_result.get('transactions', [])
-            if not new_transactions:
-                logger.warning(f"[INVESTMENT SYNC] No more transactions returned at offset {total_fetched}, stopping pagination")
-                break
+            def merge_page(offset, investment_result):
+                """Append one fetched page; returns False when pagination should stop"""
+                if not investment_result:
+                    logger.warning(f"[INVESTMENT SYNC] Failed to fetch page at offset {offset}, stopping pagination")
+                    return False
 
-            all_transactions.extend(new_transactions)
+                new_transactions = investment_result.get('transactions', [])
+                if not new_transactions:
+                    logger.warning(f"[INVESTMENT SYNC] No more transactions returned at offset {offset}, stopping pagination")
+                    return False
 
-            # Merge securities (new ones might appear in later pages)
-            new_securities = {sec['security_id']: sec for sec in investment_result.get('securities', [])}
-            all_securities.update(new_securities)
+                all_transactions.extend(new_transactions)
 
-            # Collect raw response from this page
-            all_raw_responses.append(investment_result.get('raw_response', {}))
+                # Merge securities (new ones might appear in later pages)
+                all_securities.update({sec['security_id']: sec for sec in investment_result.get('securities', [])})
+
+                # Collect raw response from this page
+                if settings.PLAID_DEBUG_MODE:
+                    all_raw_responses.append(investment_result.get('raw_response', {}))
+
+                logger.info(f"[INVESTMENT SYNC] Fetched {len(new_transactions)} more transactions, total so far: {len(all_transactions)}/{total_available}")
+                return True
 
-            total_fetched = len(all_transactions)
-            logger.info(f"[INVESTMENT SYNC] Fetched {len(new_transactions)} more transactions, total so far: {total_fetched}/{total_available}")
+            with ThreadPoolExecutor(max_workers=min(PLAID_FETCH_MAX_WORKERS, len(remaining_offsets))) as executor:
+                page_results = list(executor.map(fetch_page, remaining_offsets))
+
+            pagination_stopped = False
+            for offset, investment_result in zip(remaining_offsets, page_results):
+                # A short page earlier on leaves a gap before this offset
+                if offset != len(all_transactions):
+                    break
+                if not merge_page(offset, investment_result):
+                    pagination_stopped = True
+                    break
+
+            # Resume from the end of the contiguous pages if a short page left rows unfetched
+            if not pagination_stopped and len(all_transactions) < total_available:
+                logger.warning(
+                    f"[INVESTMENT SYNC] Pages returned fewer transactions than requested, fetching the rest "
+                    f"sequentially from offset {len(all_transactions)}"
+                )
+                while len(all_transactions) < total_available:
+                    offset = len(all_transactions)
+                    if not merge_page(offset, fetch_page(offset)):
+                        break
 
     # Common processing for both replay and normal mode
     transactions = all_transactions
@@ -896,6 +1323,10 @@ def _sync_investment_transactions(db, plaid_item, plaid_accounts, plaid_account_
     logger.info(f"[INVESTMENT SYNC DEBUG] Retrieved {len(securities)} securities")
     logger.info(f"[INVESTMENT SYNC DEBUG] Retrieved {len(investment_accounts_data)} accounts from investment API")
 
+    if not transactions:
+        logger.info("[INVESTMENT SYNC] No investment transactions returned, nothing to sync")
+        return 0
+
     # Log account balances from investment API
     for inv_acc in investment_accounts_data:
         if inv_acc.get('type') in ['investment', 'brokerage']:
@@ -904,10 +1335,11 @@ def _sync_investment_transactions(db, plaid_item, plaid_accounts, plaid_account_
     # Security: Save Plaid investment sync payload for debugging only if debug mode is enabled
     if settings.PLAID_DEBUG_MODE:
         try:
-            timestamp = datetime.utcnow().strftime("%Y%m%d_%H%M%S")
+            saved_at = datetime.utcnow()
+            timestamp = saved_at.strftime("%Y%m%d_%H%M%S")
             debug_file = PLAID_DEBUG_DIR / f"investment_sync_{plaid_item.user_id}_{plaid_item.id}_{timestamp}.json"
             debug_data = {
-                "timestamp": datetime.utcnow().isoformat(),
+                "timestamp": saved_at.isoformat(),
                 "user_id": plaid_item.user_id,
                 "plaid_item_id": plaid_item.id,
                 "institution_name": plaid_item.institution_name,
@@ -923,24 +1355,45 @@ def _sync_investment_transactions(db, plaid_item, plaid_accounts, plaid_account_
                 },
                 "raw_plaid_responses": all_raw_responses  # Save ALL raw Plaid API responses (one per page)
             }
-            with open(debug_file, 'w') as f:
-                json.dump(debug_data, f, indent=2, default=str)
+            _queue_debug_json(debug_file, debug_data)
             logger.info(
-                f"[INVESTMENT SYNC] Saved {len(all_raw_responses)} raw Plaid API responses "
+                f"[INVESTMENT SYNC] Saving {len(all_raw_responses)} raw Plaid API responses "
                 f"({len(transactions)} total transactions) to {debug_file}"
             )
         except Exception as debug_error:
             logger.warning(f"Failed to save investment sync debug payload: {debug_error}")
 
-    # Log sample of transactions if any
-    if transactions:
-        sample = transactions[:3]
-        logger.info(f"[INVESTMENT SYNC DEBUG] Sample transactions:")
-        for txn in sample:
-            logger.info(f"  - {txn.get('date')} {txn.get('type')} {txn.get('name')} ${txn.get('amount')}")
+    # Log sample of transactions
+    logger.info(f"[INVESTMENT SYNC DEBUG] Sample transactions:")
+    for txn in transactions[:3]:
+        logger.info(f"  - {txn.get('date')} {txn.get('type')} {txn.get('name')} ${txn.get('amount')}")
 
     added_count = 0
 
+    # Load the transactions that already exist in one pass instead of one query per row
+    existing_txn_ids = _load_transaction_ids_by_plaid_id(db, [inv_txn['transaction_id'] for inv_txn in transactions])
+
+    # Transactions (new and existing, keyed by Plaid ID) are upserted and new dividends
+    # inserted in bulk after the loop
+    transaction_rows = {}
+    new_dividend_rows = []
+
+    total_transactions = len(transactions)
+
+    # Pre-allocate IDs for transactions that may be created below
+    transaction_ids = _batch_uuids(total_transactions)
+
+    # Dividends already recorded for the linked accounts, keyed like the duplicate check below
+    linked_account_ids = {account_id for account_id in plaid_account_map.values() if account_id}
+    existing_dividends = set()
+    if linked_account_ids:
+        existing_dividends = {
+            tuple(row)
+            for row in db.query(Dividend.account_id, Dividend.ticker, Dividend.date, Dividend.amount).filter(
+                Dividend.account_id == _any_of(linked_account_ids)
+            )
+        }
+
     for idx, inv_txn in enumerate(transactions, 1):
         plaid_account_id = inv_txn['account_id']
         account_id = plaid_account_map.get(plaid_account_id)
@@ -958,10 +1411,10 @@ def _sync_investment_transactions(db, plaid_item, plaid_accounts, plaid_account_
         # Parse date - Plaid SDK may return string or date object
         txn_date = inv_txn['date']
         if isinstance(txn_date, str):
-            txn_date = datetime.strptime(txn_date, '%Y-%m-%d').date()
-        elif not isinstance(txn_date, type(datetime.now().date())):
+            txn_date = _parse_plaid_date(txn_date)
+        elif not isinstance(txn_date, date):
             # If it's some other type, convert to string first then parse
-            txn_date = datetime.strptime(str(txn_date), '%Y-%m-%d').date()
+            txn_date = _parse_plaid_date(str(txn_date))
 
         # Get the raw amount from Plaid and determine transaction type
         # Plaid uses positive for debits (buys/withdrawals), negative for credits (sells/deposits)
@@ -970,113 +1423,87 @@ def _sync_investment_transactions(db, plaid_item, plaid_accounts, plaid_account_
         plaid_type = str(inv_txn.get('type', '')).lower()
         plaid_subtype = str(inv_txn.get('subtype', '')).lower()
 
-        # Investment transaction amount handling depends on type and subtype:
-        # Plaid often sends deposits/earnings with negative amounts, but we need to trust the subtype
-        #
-        # IMPORTANT: For cash transactions, trust the subtype field, not the amount sign:
-        # - subtype "deposit" or contains earnings/income keywords → always POSITIVE (money IN)
-        # - subtype "withdrawal" → keep as-is or make NEGATIVE (money OUT)
-        # - Other types (buy/sell/dividend/interest) → negate the amount
-
-        if plaid_type == 'cash':
-            # Check subtype to determine if it's money in or out
-            income_keywords = ['deposit', 'earning', 'income', 'interest', 'dividend', 'refund', 'rebate']
-            is_income = any(keyword in plaid_subtype for keyword in income_keywords)
-
-            if is_income:
-                # Deposits, earnings, dividends, interest should always be positive (money IN)
-                # If Plaid sends negative amount, negate it to make positive
-                transaction_amount = abs(raw_amount)
-            else:
-                # Withdrawals, fees should always be negative (money OUT)
-                # If Plaid sends positive amount, negate it to make negative
-                transaction_amount = -abs(raw_amount)
-        else:
-            # For buy, sell, transfer, etc., negate the amount
-            # Plaid: buy=positive (debit), sell=negative (credit)
-            # Ours: money out=negative, money in=positive
-            transaction_amount = -raw_amount
+        transaction_amount = _investment_transaction_amount(raw_amount, plaid_type, plaid_subtype)
 
         # Determine transaction type based on amount using transaction_classifier
-        from app.services.transaction_classifier import transaction_classifier
         txn_type = transaction_classifier.classify_transaction(transaction_amount)
 
         # Check if transaction already exists (upsert logic)
-        existing_txn = db.query(Transaction).filter(
-            Transaction.plaid_transaction_id == inv_txn['transaction_id']
-        ).first()
+        existing_txn_id = existing_txn_ids.get(inv_txn['transaction_id'])
 
-        if existing_txn:
-            # Update existing transaction
-            existing_txn.date = txn_date
-            existing_txn.type = txn_type
-            existing_txn.total = transaction_amount
-            existing_txn.description = inv_txn.get('name')
-            existing_txn.import_sequence = idx
-            transaction = existing_txn
-            logger.debug(f"Updated existing investment transaction: {inv_txn['transaction_id']}")
-        else:
-            # Create new transaction
-            transaction = Transaction(
-                id=str(uuid.uuid4()),
-                account_id=account_id,
+        if inv_txn['transaction_id'] in transaction_rows:
+            # Repeated in this payload - the later entry wins
+            transaction_rows[inv_txn['transaction_id']].update(
                 date=txn_date,
                 type=txn_type,
                 total=transaction_amount,
                 description=inv_txn.get('name'),
-                source='plaid',
-                plaid_transaction_id=inv_txn['transaction_id'],
-                import_sequence=idx  # Preserve order from Plaid API
+                import_sequence=idx
             )
-            db.add(transaction)
-            added_count += 1
-            logger.debug(f"Created new investment transaction: {inv_txn['transaction_id']}")
+        else:
+            # Existing transactions are updated by the same statement that creates new ones
+            transaction_rows[inv_txn['transaction_id']] = {
+                "id": existing_txn_id or transaction_ids[idx - 1],
+                "account_id": account_id,
+                "date": txn_date,
+                "type": txn_type,
+                "total": transaction_amount,
+                "description": inv_txn.get('name'),
+                "source": 'plaid',
+                "plaid_transaction_id": inv_txn['transaction_id'],
+                "import_sequence": idx  # Preserve order from Plaid API
+            }
+            if existing_txn_id:
+                logger.debug("Updated existing investment transaction: %s", inv_txn['transaction_id'])
+            else:
+                added_count += 1
+                logger.debug("Created new investment transaction: %s", inv_txn['transaction_id'])
 
         # If this is a dividend or cash distribution (Money In with ticker), create a record in the dividends table
         # Dividends from ETFs/stocks appear as Money In transactions with a ticker symbol
         if txn_type == 'Money In' and ticker and plaid_type in ['dividend', 'cash']:
             # Check if dividend already exists (by plaid_transaction_id or unique combination)
             # We use ticker+date+amount+account_id as a unique identifier since dividends don't have plaid_transaction_id field
-            existing_dividend = db.query(Dividend).filter(
-                Dividend.account_id == account_id,
-                Dividend.ticker == ticker,
-                Dividend.date == datetime.combine(txn_date, datetime.min.time()),
-                Dividend.amount == transaction_amount
-            ).first()
+            dividend_date = datetime.combine(txn_date, datetime.min.time())
+            dividend_key = (account_id, ticker, dividend_date, transaction_amount)
+
+            if dividend_key not in existing_dividends:
+                existing_dividends.add(dividend_key)
+                new_dividend_rows.append({
+                    "id": None,  # Assigned in one batch before the insert
+                    "account_id": account_id,
+                    "ticker": ticker,
+                    "date": dividend_date,
+                    "amount": transaction_amount,  # Use the corrected (positive) amount
+                    "currency": 'CAD',  # Default to CAD, could be extracted from security if available
+                    "statement_id": None  # Plaid imports don't have statements
+                })
+                logger.debug("Created dividend record for %s: $%.2f on %s", ticker, transaction_amount, txn_date)
 
-            if not existing_dividend:
-                dividend = Dividend(
-                    id=str(uuid.uuid4()),
-                    account_id=account_id,
-                    ticker=ticker,
-                    date=datetime.combine(txn_date, datetime.min.time()),
-                    amount=transaction_amount,  # Use the corrected (positive) amount
-                    currency='CAD',  # Default to CAD, could be extracted from security if available
-                    statement_id=None  # Plaid imports don't have statements
-                )
-                db.add(dividend)
-                logger.debug(f"Created dividend record for {ticker}: ${transaction_amount:.2f} on {txn_date}")
-
-        # Update progress every 10 transactions
-        if idx % 10 == 0 or idx == len(transactions):
-            update_stage("processing_investments", {
-                "message": f"Processing investment transactions ({idx}/{len(transactions)})...",
-                "current": idx,
-                "total": len(transactions),
-                "added": added_count
-            })
+        update_stage("processing_investments", {
+            "message": f"Processing investment transactions ({idx}/{total_transactions})...",
+            "current": idx,
+            "total": total_transactions,
+            "added": added_count
+        })
+
+    _bulk_upsert_transactions(db, list(transaction_rows.values()), INVESTMENT_TRANSACTION_UPDATE_COLUMNS)
+    for row, dividend_id in zip(new_dividend_rows, _batch_uuids(len(new_dividend_rows))):
+        row["id"] = dividend_id
+    _bulk_insert(db, Dividend, new_dividend_rows)
 
     logger.info(f"Added {added_count} investment transactions")
     return added_count
 
 
-def _sync_investment_holdings(db, plaid_item, plaid_accounts, plaid_account_map, update_stage, holdings_data=None):
+def _sync_investment_holdings(db, plaid_item, access_token, plaid_accounts, plaid_account_map, update_stage, holdings_data=None):
     """
     Sync investment holdings (positions) for investment accounts
 
     Args:
         db: Database session
         plaid_item: PlaidItem record
+        access_token: Decrypted Plaid access token for the item
         plaid_accounts: List of PlaidAccount records
         plaid_account_map: Mapping of plaid_account_id to account_id
         update_stage: Function to update job stage
@@ -1102,7 +1529,6 @@ def _sync_investment_holdings(db, plaid_item, plaid_accounts, plaid_account_map,
     # Fetch investment holdings from Plaid if not already provided
     if holdings_data is None:
         logger.info(f"[HOLDINGS SYNC] Calling plaid_client.get_investment_holdings()...")
-        access_token = encryption_service.decrypt(plaid_item.access_token)
         try:
             holdings_data = plaid_client.get_investment_holdings(access_token)
         except Exception as e:
@@ -1126,8 +1552,6 @@ def _sync_investment_holdings(db, plaid_item, plaid_accounts, plaid_account_map,
     logger.info(f"[HOLDINGS SYNC] Retrieved {len(accounts)} accounts from holdings API")
 
     # Delete existing snapshots for today to avoid duplicates (keep only one snapshot per day)
-    from app.database.models import PositionSnapshot
-    from sqlalchemy import func, and_
 
     sync_timestamp = datetime.utcnow()
     today_start = sync_timestamp.replace(hour=0, minute=0, second=0, microsecond=0)
@@ -1139,7 +1563,7 @@ def _sync_investment_holdings(db, plaid_item, plaid_accounts, plaid_account_map,
     # Delete snapshots from today for these accounts
     deleted_count = db.query(PositionSnapshot).filter(
         and_(
-            PositionSnapshot.account_id.in_(account_ids_to_sync),
+            PositionSnapshot.account_id == _any_of(account_ids_to_sync),
             PositionSnapshot.snapshot_date >= today_start,
             PositionSnapshot.snapshot_date < today_end
         )
@@ -1147,15 +1571,26 @@ def _sync_investment_holdings(db, plaid_item, plaid_accounts, plaid_account_map,
 
     if deleted_count > 0:
         logger.info(f"[HOLDINGS SYNC] Deleted {deleted_count} existing snapshots from today to avoid duplicates")
-        db.commit()
 
     synced_count = 0
 
-    # Track metadata added in this sync to avoid duplicates
-    added_types = set()
-    added_subtypes = set()
-    added_sectors = set()
-    added_industries = set()
+    # Load the managed metadata names once; names added during this sync join the sets
+    known_types = {name for (name,) in db.query(SecurityType.name)}
+    known_subtypes = {name for (name,) in db.query(SecuritySubtype.name)}
+    known_sectors = {name for (name,) in db.query(Sector.name)}
+    known_industries = {name for (name,) in db.query(Industry.name)}
+
+    # User-defined overrides by (ticker, security name); the table is small, so load it whole
+    overrides = {}
+    for override in db.query(SecurityMetadataOverride):
+        overrides.setdefault((override.ticker, override.security_name), override)
+
+    # Pre-allocate IDs for positions and snapshots that may be created below
+    position_ids = _batch_uuids(len(holdings))
+    snapshot_ids = _batch_uuids(len(holdings))
+
+    # Snapshots are only ever inserted, so they are collected and inserted in bulk after the loop
+    new_snapshot_rows = []
 
     # Process each holding
     for idx, holding in enumerate(holdings):
@@ -1187,9 +1622,10 @@ def _sync_investment_holdings(db, plaid_item, plaid_accounts, plaid_account_map,
 
         if is_cash_equivalent or is_currency or is_cash_type:
             logger.debug(
-                f"[HOLDINGS SYNC] Skipping cash/currency position: {ticker} ({name}), "
-                f"is_cash_equivalent={is_cash_equivalent}, is_currency={is_currency}, "
-                f"type={security_type_raw}, quantity={quantity}, value=${quantity * holding.get('institution_price', 0):.2f}"
+                "[HOLDINGS SYNC] Skipping cash/currency position: %s (%s), "
+                "is_cash_equivalent=%s, is_currency=%s, type=%s, quantity=%s, value=$%.2f",
+                ticker, name, is_cash_equivalent, is_currency, security_type_raw, quantity,
+                quantity * holding.get('institution_price', 0)
             )
             continue
 
@@ -1211,69 +1647,43 @@ def _sync_investment_holdings(db, plaid_item, plaid_accounts, plaid_account_map,
         industry = security.get('industry')  # Major Banks, Major Telecommunications, etc.
 
         # Auto-add new metadata to our managed lists
-        from app.database.models import SecurityType, SecuritySubtype, Sector, Industry
-        import uuid
-
-        if security_type and security_type not in added_types:
-            existing_type = db.query(SecurityType).filter(SecurityType.name == security_type).first()
-            if not existing_type:
-                new_type = SecurityType(id=str(uuid.uuid4()), name=security_type)
-                db.add(new_type)
-                added_types.add(security_type)
-                logger.info(f"[HOLDINGS SYNC] Auto-added new security type: {security_type}")
-            else:
-                added_types.add(security_type)
-
-        if security_subtype and security_subtype not in added_subtypes:
-            existing_subtype = db.query(SecuritySubtype).filter(SecuritySubtype.name == security_subtype).first()
-            if not existing_subtype:
-                new_subtype = SecuritySubtype(id=str(uuid.uuid4()), name=security_subtype)
-                db.add(new_subtype)
-                added_subtypes.add(security_subtype)
-                logger.info(f"[HOLDINGS SYNC] Auto-added new security subtype: {security_subtype}")
-            else:
-                added_subtypes.add(security_subtype)
-
-        if sector and sector not in added_sectors:
-            existing_sector = db.query(Sector).filter(Sector.name == sector).first()
-            if not existing_sector:
-                new_sector = Sector(id=str(uuid.uuid4()), name=sector)
-                db.add(new_sector)
-                added_sectors.add(sector)
-                logger.info(f"[HOLDINGS SYNC] Auto-added new sector: {sector}")
-            else:
-                added_sectors.add(sector)
-
-        if industry and industry not in added_industries:
-            existing_industry = db.query(Industry).filter(Industry.name == industry).first()
-            if not existing_industry:
-                new_industry = Industry(id=str(uuid.uuid4()), name=industry)
-                db.add(new_industry)
-                added_industries.add(industry)
-                logger.info(f"[HOLDINGS SYNC] Auto-added new industry: {industry}")
-            else:
-                added_industries.add(industry)
+
+        if security_type and security_type not in known_types:
+            db.add(SecurityType(id=str(uuid.uuid4()), name=security_type))
+            known_types.add(security_type)
+            logger.info(f"[HOLDINGS SYNC] Auto-added new security type: {security_type}")
+
+        if security_subtype and security_subtype not in known_subtypes:
+            db.add(SecuritySubtype(id=str(uuid.uuid4()), name=security_subtype))
+            known_subtypes.add(security_subtype)
+            logger.info(f"[HOLDINGS SYNC] Auto-added new security subtype: {security_subtype}")
+
+        if sector and sector not in known_sectors:
+            db.add(Sector(id=str(uuid.uuid4()), name=sector))
+            known_sectors.add(sector)
+            logger.info(f"[HOLDINGS SYNC] Auto-added new sector: {sector}")
+
+        if industry and industry not in known_industries:
+            db.add(Industry(id=str(uuid.uuid4()), name=industry))
+            known_industries.add(industry)
+            logger.info(f"[HOLDINGS SYNC] Auto-added new industry: {industry}")
 
         # Check for user-defined overrides
-        from app.database.models import SecurityMetadataOverride
-        override = db.query(SecurityMetadataOverride).filter(
-            SecurityMetadataOverride.ticker == ticker,
-            SecurityMetadataOverride.security_name == name
-        ).first()
+        override = overrides.get((ticker, name))
 
         if override:
             if override.custom_type:
                 security_type = override.custom_type
-                logger.debug(f"[HOLDINGS SYNC] Applied custom type override: {security_type}")
+                logger.debug("[HOLDINGS SYNC] Applied custom type override: %s", security_type)
             if override.custom_subtype:
                 security_subtype = override.custom_subtype
-                logger.debug(f"[HOLDINGS SYNC] Applied custom subtype override: {security_subtype}")
+                logger.debug("[HOLDINGS SYNC] Applied custom subtype override: %s", security_subtype)
             if override.custom_sector:
                 sector = override.custom_sector
-                logger.debug(f"[HOLDINGS SYNC] Applied custom sector override: {sector}")
+                logger.debug("[HOLDINGS SYNC] Applied custom sector override: %s", sector)
             if override.custom_industry:
                 industry = override.custom_industry
-                logger.debug(f"[HOLDINGS SYNC] Applied custom industry override: {industry}")
+                logger.debug("[HOLDINGS SYNC] Applied custom industry override: %s", industry)
 
         # Get price date from security or holding
         price_as_of = None
@@ -1282,7 +1692,7 @@ def _sync_investment_holdings(db, plaid_item, plaid_accounts, plaid_account_map,
                 # Convert date to datetime
                 close_date = security.get('close_price_as_of')
                 if isinstance(close_date, str):
-                    price_as_of = datetime.strptime(close_date, '%Y-%m-%d')
+                    price_as_of = datetime.combine(_parse_plaid_date(close_date), datetime.min.time())
                 elif hasattr(close_date, 'year'):  # date object
                     price_as_of = datetime.combine(close_date, datetime.min.time())
             except Exception as e:
@@ -1292,17 +1702,19 @@ def _sync_investment_holdings(db, plaid_item, plaid_accounts, plaid_account_map,
             try:
                 inst_date = holding.get('institution_price_as_of')
                 if isinstance(inst_date, str):
-                    price_as_of = datetime.strptime(inst_date, '%Y-%m-%d')
+                    price_as_of = datetime.combine(_parse_plaid_date(inst_date), datetime.min.time())
                 elif hasattr(inst_date, 'year'):  # date object
                     price_as_of = datetime.combine(inst_date, datetime.min.time())
             except Exception as e:
                 logger.warning(f"[HOLDINGS SYNC] Failed to parse institution_price_as_of: {e}")
 
-        logger.debug(f"[HOLDINGS SYNC] Processing: {ticker} - {name}, Qty: {quantity}, Price: ${price:.2f}")
-        logger.debug(f"[HOLDINGS SYNC]   Type: {security_type}, Subtype: {security_subtype}, Sector: {sector}, Industry: {industry}")
+        logger.debug("[HOLDINGS SYNC] Processing: %s - %s, Qty: %s, Price: $%.2f", ticker, name, quantity, price)
+        logger.debug(
+            "[HOLDINGS SYNC]   Type: %s, Subtype: %s, Sector: %s, Industry: %s",
+            security_type, security_subtype, sector, industry
+        )
 
         # Check if position already exists for this account and ticker
-        from app.database.models import Position
         existing_position = db.query(Position).filter(
             Position.account_id == account_id,
             Position.ticker == ticker
@@ -1328,10 +1740,10 @@ def _sync_investment_holdings(db, plaid_item, plaid_accounts, plaid_account_map,
             existing_position.has_live_price = institution_price is not None and institution_price > 0
             existing_position.price_source = 'plaid' if institution_price else None
             position_id = existing_position.id
-            logger.debug(f"[HOLDINGS SYNC] Updated position: {ticker}")
+            logger.debug("[HOLDINGS SYNC] Updated position: %s", ticker)
         else:
             # Create new position
-            position_id = str(uuid.uuid4())
+            position_id = position_ids[idx]
             new_position = Position(
                 id=position_id,
                 account_id=account_id,
@@ -1355,69 +1767,113 @@ def _sync_investment_holdings(db, plaid_item, plaid_accounts, plaid_account_map,
                 price_source='plaid' if institution_price else None
             )
             db.add(new_position)
-            logger.debug(f"[HOLDINGS SYNC] Created new position: {ticker}")
+            logger.debug("[HOLDINGS SYNC] Created new position: %s", ticker)
 
         # Create snapshot for historical tracking
-        snapshot = PositionSnapshot(
-            id=str(uuid.uuid4()),
-            position_id=position_id,
-            account_id=account_id,
-            ticker=ticker,
-            name=name,
-            quantity=quantity,
-            book_value=cost_basis,
-            market_value=market_value,
-            security_type=security_type,
-            security_subtype=security_subtype,
-            sector=sector,
-            industry=industry,
-            institution_price=institution_price,
-            price_as_of=price_as_of,
-            snapshot_date=sync_timestamp,
-            created_at=sync_timestamp
-        )
-        db.add(snapshot)
-        logger.debug(f"[HOLDINGS SYNC] Created snapshot for {ticker}")
+        new_snapshot_rows.append({
+            "id": snapshot_ids[idx],
+            "position_id": position_id,
+            "account_id": account_id,
+            "ticker": ticker,
+            "name": name,
+            "quantity": quantity,
+            "book_value": cost_basis,
+            "market_value": market_value,
+            "security_type": security_type,
+            "security_subtype": security_subtype,
+            "sector": sector,
+            "industry": industry,
+            "institution_price": institution_price,
+            "price_as_of": price_as_of,
+            "snapshot_date": sync_timestamp,
+            "created_at": sync_timestamp
+        })
+        logger.debug("[HOLDINGS SYNC] Created snapshot for %s", ticker)
 
         synced_count += 1
 
-        if (idx + 1) % 10 == 0:
-            update_stage("syncing_holdings", {
-                "message": f"Syncing investment positions ({idx + 1}/{len(holdings)})...",
-                "current": idx + 1,
-                "total": len(holdings)
-            })
+        update_stage("syncing_holdings", {
+            "message": f"Syncing investment positions ({idx + 1}/{len(holdings)})...",
+            "current": idx + 1,
+            "total": len(holdings)
+        })
+
+    _bulk_insert(db, PositionSnapshot, new_snapshot_rows)
 
     logger.info(f"[HOLDINGS SYNC] Synced {synced_count} holdings")
     return synced_count
 
 
-def _map_investment_type(plaid_type) -> str:
+def _load_linked_accounts(db, plaid_accounts, plaid_account_map) -> dict:
     """
-    Map Plaid investment transaction type to our transaction type
+    Load the Account records linked to ``plaid_accounts`` in a single query
+
+    Returns:
+        Mapping of account_id to Account
+    """
+    account_ids = [
+        plaid_account_map[pa.plaid_account_id]
+        for pa in plaid_accounts
+        if plaid_account_map.get(pa.plaid_account_id)
+    ]
+    if not account_ids:
+        return {}
+    return {
+        account.id: account
+        for account in db.query(Account).filter(Account.id == _any_of(account_ids))
+    }
+
+
+def _fetch_plaid_balances(access_token):
+    """
+    Fetch the current balance of every account on the item from Plaid
 
     Args:
-        plaid_type: Plaid investment transaction type (InvestmentTransactionType object or string)
+        access_token: Decrypted Plaid access token for the item
 
     Returns:
-        Our transaction type (uppercase to match database enum)
+        Mapping of plaid_account_id to balance, or None if Plaid could not be reached
     """
-    type_mapping = {
-        'buy': 'BUY',
-        'sell': 'SELL',
-        'cash': 'DEPOSIT',
-        'fee': 'FEE',
-        'transfer': 'TRANSFER',
-        'dividend': 'DIVIDEND',
-        'interest': 'INTEREST',
-    }
+    try:
+        accounts_data = plaid_client.get_accounts(access_token)
+    except Exception as e:
+        logger.warning(f"[BALANCE] Could not fetch account data from Plaid: {e}")
+        return None
+
+    if not accounts_data:
+        return None
+
+    # Create mapping of plaid_account_id to balance
+    return {acc['account_id']: _plaid_balance(acc) for acc in accounts_data['accounts']}
 
-    # Convert Plaid SDK type object to string before processing
-    type_str = str(plaid_type).lower() if plaid_type else 'other'
-    return type_mapping.get(type_str, 'TRANSFER')  # Default to TRANSFER for unmapped types
 
+def _plaid_balance(acc: dict) -> float:
+    """
+    Balance to use for one account from the Plaid accounts API
 
-def _update_opening_balances(db, plaid_item, plaid_accounts, plaid_account_map, holdings_data=None):
+    For investment accounts, use available balance (cash only, since holdings are shown in portfolio).
+    For other accounts, use current balance.
+    """
+    acc_type = acc.get('type')
+    # to_dict() gives plain strings; extract the string value from enum-like objects otherwise
+    if acc_type and type(acc_type) is not str:
+        acc_type = acc_type.value if hasattr(acc_type, 'value') else str(acc_type)
+
+    balances = acc['balances']
+    if acc_type != 'investment':
+        return balances.get('current', 0.0) or 0.0
+
+    # This avoids double-counting holdings which are already shown in portfolio
+    balance = balances.get('available', 0.0) or 0.0
+    total_value = balances.get('current', 0.0) or 0.0
+    logger.info(
+        f"[BALANCE] Investment account {acc.get('name')}: "
+        f"Available (Cash)=${balance:.2f}, Total=${total_value:.2f}"
+    )
+    return balance
+
+
+def _update_opening_balances(db, plaid_accounts, plaid_account_map, accounts_by_id, plaid_balances):
     """
     Update account balances and transaction expected_balances after Plaid sync
 
@@ -1427,192 +1883,179 @@ def _update_opening_balances(db, plaid_item, plaid_accounts, plaid_account_map,
 
     Args:
         db: Database session
-        plaid_item: PlaidItem record
         plaid_accounts: List of PlaidAccount records
         plaid_account_map: Mapping of plaid_account_id to account_id
-        holdings_data: Optional pre-fetched holdings data from Plaid (if None, will fetch)
+        accounts_by_id: Linked Account records keyed by account_id
+        plaid_balances: Current Plaid balances keyed by plaid_account_id (see _fetch_plaid_balances)
     """
     try:
-        # Security: Decrypt access token before using
-        access_token = encryption_service.decrypt(plaid_item.access_token)
-
-        # Get fresh account data from Plaid
-        accounts_data = plaid_client.get_accounts(access_token)
-        if not accounts_data:
-            logger.warning("Could not fetch account data for opening balance update")
-            return
-
-        # Get investment holdings to extract cash balances
-        investment_cash_balances = {}
-        if holdings_data is None:
-            logger.info("[UPDATE BALANCES] Fetching investment holdings data...")
-            holdings_data = plaid_client.get_investment_holdings(access_token)
-        else:
-            logger.info("[UPDATE BALANCES] Using pre-fetched holdings data (avoiding redundant API call)")
-
-        if holdings_data:
-            # Use calculated cash balances (Total Account Value - Holdings Value)
-            investment_cash_balances = holdings_data.get('cash_balances', {})
-
-        # Create mapping of plaid_account_id to balance
-        # For investment accounts, use available balance (cash only, since holdings are shown in portfolio)
-        # For other accounts, use current balance from accounts API
-        plaid_balances = {}
-        for acc in accounts_data['accounts']:
-            acc_type = acc.get('type')
-            # Extract string value from enum-like objects
-            if acc_type and hasattr(acc_type, 'value'):
-                acc_type = acc_type.value
-            elif acc_type:
-                acc_type = str(acc_type)
-
-            # For investment accounts, use available balance (cash only)
-            # This avoids double-counting holdings which are already shown in portfolio
-            if acc_type == 'investment':
-                balance = acc['balances'].get('available', 0.0) or 0.0
-                total_value = acc['balances'].get('current', 0.0) or 0.0
-                logger.info(
-                    f"[BALANCE] Investment account {acc.get('name')}: "
-                    f"Available (Cash)=${balance:.2f}, Total=${total_value:.2f}"
-                )
-            else:
-                balance = acc['balances'].get('current', 0.0) or 0.0
+        with db.begin_nested():
+            if not accounts_by_id:
+                logger.info("[BALANCE] No linked accounts, skipping opening balance update")
+                return
 
-            plaid_balances[acc['account_id']] = balance
+            if plaid_balances is None:
+                logger.warning("Could not fetch account data for opening balance update")
+                return
 
-        # Update each account
-        for plaid_account in plaid_accounts:
-            account_id = plaid_account_map.get(plaid_account.plaid_account_id)
-            if not account_id:
-                continue
-
-            # Get our Account record
-            account = db.query(Account).filter(Account.id == account_id).first()
-            if not account:
-                continue
-
-            # Get all transactions for this account
+            # Get all transactions for these accounts in one query, grouped per account
             # Sort by date (date part only), then by value DESC (credits before debits), then by ID
-            from sqlalchemy import cast, Date
-            transactions = db.query(Transaction).filter(
-                Transaction.account_id == account_id
+            # Only the columns used by the balance calculation are loaded, streamed in batches
+            balance_rows = db.query(
+                Transaction.id,
+                Transaction.account_id,
+                Transaction.date,
+                Transaction.total,
+                Transaction.plaid_transaction_id,
+                Transaction.actual_balance,
+                Transaction.expected_balance
+            ).filter(
+                Transaction.account_id == _any_of(accounts_by_id)
             ).order_by(
+                Transaction.account_id,
                 cast(Transaction.date, Date).asc(),
                 Transaction.total.desc(),
                 Transaction.id.asc()
-            ).all()
+            ).yield_per(1000)
+            transactions_by_account = {
+                account_id: list(account_transactions)
+                for account_id, account_transactions in groupby(balance_rows, key=lambda txn: txn.account_id)
+            }
 
-            if not transactions:
-                # No transactions yet, keep current opening balance
-                logger.info(f"Account {account.label} has no transactions, keeping opening balance")
-                continue
-
-            # Get current balance from Plaid (may be None or 0 if unavailable)
-            current_plaid_balance = plaid_balances.get(plaid_account.plaid_account_id)
-
-            # For credit cards and loans, Plaid returns positive balance = amount owed
-            # We need to negate it so owing money = negative balance in our system
-            liability_account_types = ['credit_card', 'mortgage', 'auto_loan', 'student_loan',
-                                      'home_equity', 'personal_loan', 'business_loan', 'line_of_credit']
-            if current_plaid_balance and account.account_type.value in liability_account_types:
-                logger.info(f"Liability account {account.label} ({account.account_type.value}): negating Plaid balance ${current_plaid_balance:.2f} -> ${-current_plaid_balance:.2f}")
-                current_plaid_balance = -current_plaid_balance
-
-            # Check if Plaid balance is available (not None and not 0 for investment accounts)
-            is_investment = account.account_type.value in ['investment', 'brokerage', 'rrsp', 'tfsa']
-            plaid_balance_unavailable = (
-                current_plaid_balance is None or
-                (is_investment and current_plaid_balance == 0.0)
-            )
+            # Recalculated expected balances by transaction ID, written in one bulk UPDATE at the end
+            expected_balances = {}
 
-            if plaid_balance_unavailable:
-                # Plaid balance is unavailable - use last statement transaction balance as anchor
-                logger.info(
-                    f"[BALANCE] Plaid balance unavailable for {account.label} "
-                    f"(is_investment={is_investment}, balance={current_plaid_balance})"
+            # Update each account
+            for plaid_account in plaid_accounts:
+                account_id = plaid_account_map.get(plaid_account.plaid_account_id)
+                if not account_id:
+                    continue
+
+                # Get our Account record
+                account = accounts_by_id.get(account_id)
+                if not account:
+                    continue
+
+                # Get all transactions for this account
+                transactions = transactions_by_account.get(account_id, [])
+
+                if not transactions:
+                    # No transactions yet, keep current opening balance
+                    logger.info(f"Account {account.label} has no transactions, keeping opening balance")
+                    continue
+
+                # Get current balance from Plaid (may be None or 0 if unavailable)
+                current_plaid_balance = plaid_balances.get(plaid_account.plaid_account_id)
+
+                # For credit cards and loans, Plaid returns positive balance = amount owed
+                # We need to negate it so owing money = negative balance in our system
+                if current_plaid_balance and account.account_type.value in LIABILITY_ACCOUNT_TYPES:
+                    logger.info(f"Liability account {account.label} ({account.account_type.value}): negating Plaid balance ${current_plaid_balance:.2f} -> ${-current_plaid_balance:.2f}")
+                    current_plaid_balance = -current_plaid_balance
+
+                # Check if Plaid balance is available (not None and not 0 for investment accounts)
+                is_investment = account.account_type.value in INVESTMENT_ACCOUNT_TYPES
+                plaid_balance_unavailable = (
+                    current_plaid_balance is None or
+                    (is_investment and current_plaid_balance == 0.0)
                 )
 
-                # Find the last transaction BEFORE the first Plaid transaction
-                # This would be a statement-imported transaction with balance info
-                first_plaid_txn = next((txn for txn in transactions if txn.plaid_transaction_id is not None), None)
-
-                if first_plaid_txn:
-                    # Find last statement transaction before first Plaid transaction
-                    last_statement_txn = None
-                    for txn in reversed(transactions):
-                        if txn.date < first_plaid_txn.date and txn.plaid_transaction_id is None:
-                            last_statement_txn = txn
-                            break
-
-                    if last_statement_txn and (last_statement_txn.actual_balance or last_statement_txn.expected_balance):
-                        # Use the balance from the last statement transaction as anchor
-                        anchor_balance = last_statement_txn.actual_balance or last_statement_txn.expected_balance
-                        logger.info(
-                            f"[BALANCE] Using last statement transaction balance as anchor: "
-                            f"${anchor_balance:.2f} from {last_statement_txn.date}"
-                        )
+                if plaid_balance_unavailable:
+                    # Plaid balance is unavailable - use last statement transaction balance as anchor
+                    logger.info(
+                        f"[BALANCE] Plaid balance unavailable for {account.label} "
+                        f"(is_investment={is_investment}, balance={current_plaid_balance})"
+                    )
 
-                        # Calculate FORWARD from anchor for all newer transactions
-                        running_balance = anchor_balance
-                        for txn in transactions:
-                            if txn.date < last_statement_txn.date:
-                                # Keep existing expected_balance for transactions before anchor
-                                continue
-                            elif txn.id == last_statement_txn.id:
-                                # Set anchor transaction expected_balance
-                                txn.expected_balance = round(anchor_balance, 2)
-                            else:
-                                # Calculate forward for transactions after anchor
-                                running_balance += txn.total
-                                txn.expected_balance = round(running_balance, 2)
+                    # Find the last transaction BEFORE the first Plaid transaction
+                    # This would be a statement-imported transaction with balance info
+                    first_plaid_txn = next((txn for txn in transactions if txn.plaid_transaction_id is not None), None)
+
+                    if first_plaid_txn:
+                        # Find last statement transaction before first Plaid transaction
+                        last_statement_txn = None
+                        for txn in reversed(transactions):
+                            if txn.date < first_plaid_txn.date and txn.plaid_transaction_id is None:
+                                last_statement_txn = txn
+                                break
+
+                        if last_statement_txn and (last_statement_txn.actual_balance or last_statement_txn.expected_balance):
+                            # Use the balance from the last statement transaction as anchor
+                            anchor_balance = last_statement_txn.actual_balance or last_statement_txn.expected_balance
+                            logger.info(
+                                f"[BALANCE] Using last statement transaction balance as anchor: "
+                                f"${anchor_balance:.2f} from {last_statement_txn.date}"
+                            )
 
-                        # Set account balance to the last transaction's expected_balance
-                        last_txn = transactions[-1]
-                        account.balance = last_txn.expected_balance
+                            # Calculate FORWARD from anchor for all newer transactions
+                            running_balance = anchor_balance
+                            for txn in transactions:
+                                if txn.date < last_statement_txn.date:
+                                    # Keep existing expected_balance for transactions before anchor
+                                    continue
+                                elif txn.id == last_statement_txn.id:
+                                    # Set anchor transaction expected_balance
+                                    expected_balances[txn.id] = round(anchor_balance, 2)
+                                else:
+                                    # Calculate forward for transactions after anchor
+                                    running_balance += txn.total
+                                    expected_balances[txn.id] = round(running_balance, 2)
+
+                            # Set account balance to the last transaction's expected_balance
+                            last_txn = transactions[-1]
+                            account.balance = expected_balances.get(last_txn.id, last_txn.expected_balance)
+
+                            logger.info(
+                                f"[BALANCE] Calculated forward from anchor ${anchor_balance:.2f}, "
+                                f"final account balance: ${account.balance:.2f} "
+                                f"({len([t for t in transactions if t.date >= last_statement_txn.date])} transactions processed)"
+                            )
+                            continue
 
-                        logger.info(
-                            f"[BALANCE] Calculated forward from anchor ${anchor_balance:.2f}, "
-                            f"final account balance: ${account.balance:.2f} "
-                            f"({len([t for t in transactions if t.date >= last_statement_txn.date])} transactions processed)"
-                        )
-                        continue
+                    # No anchor found, calculate from first transaction with 0 starting balance
+                    logger.warning(
+                        f"[BALANCE] No statement transaction anchor found for {account.label}, "
+                        f"calculating from first transaction with 0 starting balance"
+                    )
+                    running_balances = _running_balances(0.0, [txn.total for txn in transactions])
+                    expected_balances.update(zip((txn.id for txn in transactions), running_balances[1:]))
 
-                # No anchor found, calculate from first transaction with 0 starting balance
-                logger.warning(
-                    f"[BALANCE] No statement transaction anchor found for {account.label}, "
-                    f"calculating from first transaction with 0 starting balance"
+                    # Set account balance to the last transaction's expected_balance
+                    account.balance = expected_balances[transactions[-1].id]
+                    logger.info(f"[BALANCE] Set account balance to ${account.balance:.2f} from last transaction")
+                    continue
+
+                # Plaid balance is available - use it as anchor and calculate backward
+                # Set account balance to current Plaid balance
+                account.balance = current_plaid_balance
+
+                # Calculate BACKWARD from current balance to set expected_balance on all transactions
+                # Each transaction's balance is the one after it minus its total; the last one is the Plaid balance
+                running_balances = _running_balances(current_plaid_balance, [-txn.total for txn in reversed(transactions[1:])])
+                expected_balances.update(zip((txn.id for txn in reversed(transactions)), running_balances))
+
+                logger.info(
+                    f"[BALANCE] Set account balance to ${account.balance:.2f} from Plaid, "
+                    f"calculated backward for {len(transactions)} transactions"
                 )
-                running_balance = 0.0
-                for txn in transactions:
-                    running_balance += txn.total
-                    txn.expected_balance = round(running_balance, 2)
-
-                # Set account balance to the last transaction's expected_balance
-                account.balance = transactions[-1].expected_balance
-                logger.info(f"[BALANCE] Set account balance to ${account.balance:.2f} from last transaction")
-                continue
-
-            # Plaid balance is available - use it as anchor and calculate backward
-            # Set account balance to current Plaid balance
-            account.balance = current_plaid_balance
-
-            # Calculate BACKWARD from current balance to set expected_balance on all transactions
-            running_balance = current_plaid_balance
-            for txn in reversed(transactions):
-                txn.expected_balance = round(running_balance, 2)
-                running_balance -= txn.total
 
-            logger.info(
-                f"[BALANCE] Set account balance to ${account.balance:.2f} from Plaid, "
-                f"calculated backward for {len(transactions)} transactions"
-            )
+            # Only rows whose expected balance actually changed need an UPDATE
+            balance_updates = [
+                {"id": txn.id, "expected_balance": expected_balances[txn.id]}
+                for account_transactions in transactions_by_account.values()
+                for txn in account_transactions
+                if txn.id in expected_balances and txn.expected_balance != expected_balances[txn.id]
+            ]
+            if balance_updates:
+                db.bulk_update_mappings(Transaction, balance_updates)
+                logger.info(f"[BALANCE] Updated expected_balance on {len(balance_updates)} transactions")
 
     except Exception as e:
         logger.error(f"Error updating opening balances: {e}", exc_info=True)
         # Don't raise - this is not critical enough to fail the entire sync
 
 
-def _update_first_plaid_transaction_date(db, plaid_accounts, plaid_account_map):
+def _update_first_plaid_transaction_date(db, plaid_accounts, plaid_account_map, accounts_by_id):
     """
     Update first_plaid_transaction_date for accounts during full sync
 
@@ -1623,51 +2066,58 @@ def _update_first_plaid_transaction_date(db, plaid_accounts, plaid_account_map):
         db: Database session
         plaid_accounts: List of PlaidAccount records
         plaid_account_map: Mapping of plaid_account_id to account_id
+        accounts_by_id: Linked Account records keyed by account_id
     """
     try:
-        logger.info("[FIRST TXN DATE] Updating first Plaid transaction dates for accounts")
-
-        for plaid_account in plaid_accounts:
-            account_id = plaid_account_map.get(plaid_account.plaid_account_id)
-            if not account_id:
-                continue
+        with db.begin_nested():
+            if not accounts_by_id:
+                logger.info("[FIRST TXN DATE] No linked accounts, skipping first Plaid transaction date update")
+                return
 
-            # Get our Account record
-            account = db.query(Account).filter(Account.id == account_id).first()
-            if not account:
-                continue
+            logger.info("[FIRST TXN DATE] Updating first Plaid transaction dates for accounts")
 
-            # Get the earliest Plaid transaction for this account
+            # Get the earliest Plaid transaction date for every account in one aggregate query
             # Only consider transactions with plaid_transaction_id (i.e., from Plaid)
-            from sqlalchemy import cast, Date
-            earliest_transaction = db.query(Transaction).filter(
-                Transaction.account_id == account_id,
-                Transaction.plaid_transaction_id.isnot(None)
-            ).order_by(
-                cast(Transaction.date, Date).asc()
-            ).first()
+            earliest_dates = dict(
+                db.query(Transaction.account_id, func.min(Transaction.date)).filter(
+                    Transaction.account_id == _any_of(accounts_by_id),
+                    Transaction.plaid_transaction_id.isnot(None)
+                ).group_by(Transaction.account_id).all()
+            )
 
-            if earliest_transaction:
-                first_date = datetime.combine(earliest_transaction.date, datetime.min.time())
-                account.first_plaid_transaction_date = first_date
-                logger.info(
-                    f"[FIRST TXN DATE] Set first Plaid transaction date for {account.label}: "
-                    f"{earliest_transaction.date}"
-                )
-            else:
-                logger.info(
-                    f"[FIRST TXN DATE] No Plaid transactions found for {account.label}, "
-                    f"skipping first transaction date update"
-                )
+            for plaid_account in plaid_accounts:
+                account_id = plaid_account_map.get(plaid_account.plaid_account_id)
+                if not account_id:
+                    continue
+
+                # Get our Account record
+                account = accounts_by_id.get(account_id)
+                if not account:
+                    continue
 
-        logger.info("[FIRST TXN DATE] Completed updating first Plaid transaction dates")
+                earliest_date = earliest_dates.get(account_id)
+
+                if earliest_date:
+                    first_date = datetime.combine(earliest_date, datetime.min.time())
+                    account.first_plaid_transaction_date = first_date
+                    logger.info(
+                        f"[FIRST TXN DATE] Set first Plaid transaction date for {account.label}: "
+                        f"{earliest_date}"
+                    )
+                else:
+                    logger.info(
+                        f"[FIRST TXN DATE] No Plaid transactions found for {account.label}, "
+                        f"skipping first transaction date update"
+                    )
+
+            logger.info("[FIRST TXN DATE] Completed updating first Plaid transaction dates")
 
     except Exception as e:
         logger.error(f"Error updating first Plaid transaction dates: {e}", exc_info=True)
         # Don't raise - this is not critical enough to fail the entire sync
 
 
-def _cleanup_overlapping_transactions(db, plaid_accounts, plaid_account_map):
+def _cleanup_overlapping_transactions(db, plaid_accounts, plaid_account_map, accounts_by_id):
     """
     Delete non-Plaid transactions that overlap with Plaid transaction history during full sync
 
@@ -1679,70 +2129,82 @@ def _cleanup_overlapping_transactions(db, plaid_accounts, plaid_account_map):
         db: Database session
         plaid_accounts: List of PlaidAccount records
         plaid_account_map: Mapping of plaid_account_id to account_id
+        accounts_by_id: Linked Account records keyed by account_id
     """
     try:
-        logger.info("[CLEANUP OVERLAP] Cleaning up overlapping non-Plaid transactions")
+        with db.begin_nested():
+            logger.info("[CLEANUP OVERLAP] Cleaning up overlapping non-Plaid transactions")
 
-        total_deleted_transactions = 0
-        total_deleted_expenses = 0
+            # Collect the first Plaid transaction date of every linked account
+            first_plaid_dates = {}
+            for plaid_account in plaid_accounts:
+                account_id = plaid_account_map.get(plaid_account.plaid_account_id)
+                if not account_id:
+                    continue
 
-        for plaid_account in plaid_accounts:
-            account_id = plaid_account_map.get(plaid_account.plaid_account_id)
-            if not account_id:
-                continue
+                # Get our Account record
+                account = accounts_by_id.get(account_id)
+                if not account or not account.first_plaid_transaction_date:
+                    continue
 
-            # Get our Account record
-            account = db.query(Account).filter(Account.id == account_id).first()
-            if not account or not account.first_plaid_transaction_date:
-                continue
+                first_plaid_dates[account_id] = account.first_plaid_transaction_date
 
-            first_plaid_date = account.first_plaid_transaction_date
+            if not first_plaid_dates:
+                logger.info("[CLEANUP OVERLAP] No overlapping transactions to delete")
+                return
 
-            # Find all non-Plaid transactions on or after the first Plaid transaction date
-            from sqlalchemy import cast, Date
-            overlapping_transactions = db.query(Transaction).filter(
-                Transaction.account_id == account_id,
+            # All non-Plaid transactions on or after each account's first Plaid transaction date,
+            # deleted server-side for every account at once without loading them into the session
+            overlap_criteria = (
                 Transaction.plaid_transaction_id.is_(None),  # Non-Plaid transactions only
-                cast(Transaction.date, Date) >= cast(first_plaid_date, Date)
-            ).all()
-
-            if overlapping_transactions:
-                overlapping_transaction_ids = [txn.id for txn in overlapping_transactions]
-
-                logger.info(
-                    f"[CLEANUP OVERLAP] Found {len(overlapping_transactions)} non-Plaid transactions "
-                    f"for {account.label} on or after {first_plaid_date.date()}"
-                )
-
-                # Delete associated expenses first
-                deleted_expenses = db.query(Expense).filter(
-                    Expense.transaction_id.in_(overlapping_transaction_ids)
-                ).delete(synchronize_session=False)
+                or_(*(
+                    and_(
+                        Transaction.account_id == account_id,
+                        # Compared against midnight rather than casting the column, so the date index applies
+                        Transaction.date >= datetime.combine(first_plaid_date.date(), datetime.min.time())
+                    )
+                    for account_id, first_plaid_date in first_plaid_dates.items()
+                ))
+            )
 
-                # Delete the overlapping transactions
-                deleted_transactions = db.query(Transaction).filter(
-                    Transaction.id.in_(overlapping_transaction_ids)
-                ).delete(synchronize_session=False)
+            # Delete associated expenses first
+            deleted_expenses = Counter(db.execute(
+                delete(Expense)
+                .where(Expense.transaction_id.in_(select(Transaction.id).where(*overlap_criteria)))
+                .returning(Expense.account_id)
+                .execution_options(synchronize_session=False)
+            ).scalars())
+
+            # Delete the overlapping transactions
+            deleted_transactions = Counter(db.execute(
+                delete(Transaction)
+                .where(*overlap_criteria)
+                .returning(Transaction.account_id)
+                .execution_options(synchronize_session=False)
+            ).scalars())
+
+            for account_id, first_plaid_date in first_plaid_dates.items():
+                account = accounts_by_id[account_id]
+                if deleted_transactions[account_id]:
+                    logger.info(
+                        f"[CLEANUP OVERLAP] Deleted {deleted_transactions[account_id]} non-Plaid transactions and "
+                        f"{deleted_expenses[account_id]} expenses for {account.label} on or after {first_plaid_date.date()}"
+                    )
+                else:
+                    logger.info(
+                        f"[CLEANUP OVERLAP] No overlapping non-Plaid transactions found for {account.label}"
+                    )
 
-                total_deleted_transactions += deleted_transactions
-                total_deleted_expenses += deleted_expenses
+            total_deleted_transactions = sum(deleted_transactions.values())
+            total_deleted_expenses = sum(deleted_expenses.values())
 
+            if total_deleted_transactions > 0:
                 logger.info(
-                    f"[CLEANUP OVERLAP] Deleted {deleted_transactions} transactions and "
-                    f"{deleted_expenses} expenses for {account.label}"
+                    f"[CLEANUP OVERLAP] Total deleted: {total_deleted_transactions} transactions, "
+                    f"{total_deleted_expenses} expenses across all accounts"
                 )
             else:
-                logger.info(
-                    f"[CLEANUP OVERLAP] No overlapping non-Plaid transactions found for {account.label}"
-                )
-
-        if total_deleted_transactions > 0:
-            logger.info(
-                f"[CLEANUP OVERLAP] Total deleted: {total_deleted_transactions} transactions, "
-                f"{total_deleted_expenses} expenses across all accounts"
-            )
-        else:
-            logger.info("[CLEANUP OVERLAP] No overlapping transactions to delete")
+                logger.info("[CLEANUP OVERLAP] No overlapping transactions to delete")
 
     except Exception as e:
         logger.error(f"Error cleaning up overlapping transactions: {e}", exc_info=True)
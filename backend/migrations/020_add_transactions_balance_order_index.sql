@@ -0,0 +1,12 @@
+-- Migration: Add index for per-account balance ordering of transactions
+-- Date: 2026-10-17
+-- Description: Serves the ORDER BY used when recalculating expected balances after a Plaid sync
+--              (account, calendar date, credits before debits, id) directly from an index
+
+-- transactions.date is a TIMESTAMP; the balance pass orders by its date part so that
+-- same-day transactions are ordered by amount, so the index is on the same expression
+CREATE INDEX IF NOT EXISTS idx_transactions_account_day_total_id
+ON transactions(account_id, (CAST(date AS DATE)), total DESC, id);
+
+-- Add comment for documentation
+COMMENT ON INDEX idx_transactions_account_day_total_id IS 'Matches the (account_id, date::date, total DESC, id) ordering used by the Plaid sync opening-balance calculation.';
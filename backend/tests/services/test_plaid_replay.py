@@ -0,0 +1,54 @@
+from pathlib import Path
+import sys
+
+BACKEND_PATH = Path(__file__).resolve().parents[2]
+if str(BACKEND_PATH) not in sys.path:
+    sys.path.insert(0, str(BACKEND_PATH))
+
+from app.services.plaid_replay import iter_transaction_pages_from_debug_data
+
+
+def test_full_resync_yields_one_page_per_saved_response():
+    debug_data = {
+        "sync_type": "full_resync",
+        "raw_plaid_responses": [
+            {"transactions": [{"transaction_id": "t1"}, {"transaction_id": "t2"}]},
+            {"transactions": [{"transaction_id": "t3"}]},
+            {},
+        ],
+    }
+
+    pages = list(iter_transaction_pages_from_debug_data(debug_data))
+
+    assert [[txn["transaction_id"] for txn in page["added"]] for page in pages] == [["t1", "t2"], ["t3"], []]
+    assert [page["has_more"] for page in pages] == [True, True, False]
+    for page in pages:
+        assert page["modified"] == []
+        assert page["removed"] == []
+        assert page["next_cursor"] is None
+
+
+def test_full_resync_without_responses_yields_single_empty_page():
+    pages = list(iter_transaction_pages_from_debug_data({"sync_type": "full_resync"}))
+
+    assert pages == [{"added": [], "modified": [], "removed": [], "next_cursor": None, "has_more": False}]
+
+
+def test_incremental_yields_saved_response():
+    raw_response = {
+        "added": [{"transaction_id": "a"}],
+        "modified": [{"transaction_id": "m"}],
+        "removed": [{"transaction_id": "r"}],
+        "next_cursor": "cursor-1",
+        "has_more": False,
+    }
+
+    pages = list(iter_transaction_pages_from_debug_data({"sync_type": "incremental", "raw_plaid_response": raw_response}))
+
+    assert pages == [raw_response]
+
+
+def test_unknown_sync_type_yields_single_empty_page():
+    pages = list(iter_transaction_pages_from_debug_data({"sync_type": "something_else"}))
+
+    assert pages == [{"added": [], "modified": [], "removed": [], "next_cursor": None, "has_more": False}]
@@ -0,0 +1,26 @@
+from pathlib import Path
+import importlib
+import sys
+
+import pytest
+
+BACKEND_PATH = Path(__file__).resolve().parents[2]
+if str(BACKEND_PATH) not in sys.path:
+    sys.path.insert(0, str(BACKEND_PATH))
+
+# Packages that other test modules replace with bare stand-ins via sys.modules
+STUBBED_MODULES = ("sqlalchemy", "redis", "rq", "rq.job", "rq.exceptions")
+
+
+@pytest.fixture(scope="session")
+def plaid_sync():
+    """The real app.tasks.plaid_sync, imported with any stubbed dependencies set aside"""
+    stubs = {
+        name: sys.modules.pop(name)
+        for name in STUBBED_MODULES
+        if name in sys.modules and not hasattr(sys.modules[name], "__file__")
+    }
+    try:
+        yield importlib.import_module("app.tasks.plaid_sync")
+    finally:
+        sys.modules.update(stubs)
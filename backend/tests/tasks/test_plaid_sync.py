@@ -0,0 +1,213 @@
+from contextlib import nullcontext
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+import uuid
+
+
+class _FakeQuery:
+    def __init__(self, rows):
+        self._rows = rows
+
+    def filter(self, *_args, **_kwargs):
+        return self
+
+    def order_by(self, *_args, **_kwargs):
+        return self
+
+    def yield_per(self, *_args, **_kwargs):
+        return iter(self._rows)
+
+
+class _FakeSession:
+    """Serves the balance query from memory, ordered like the ORDER BY in the task"""
+
+    def __init__(self, rows):
+        self._rows = sorted(rows, key=lambda txn: (txn.account_id, txn.date.date(), -txn.total, txn.id))
+        self.updates = {}
+
+    def begin_nested(self):
+        return nullcontext()
+
+    def query(self, *_columns):
+        return _FakeQuery(self._rows)
+
+    def bulk_update_mappings(self, _model, mappings):
+        self.updates.update({mapping["id"]: mapping["expected_balance"] for mapping in mappings})
+
+
+def _reference_opening_balances(plaid_sync, transactions, account, current_plaid_balance):
+    """The original per-row balance calculation, applied to one account in place"""
+    if current_plaid_balance and account.account_type.value in plaid_sync.LIABILITY_ACCOUNT_TYPES:
+        current_plaid_balance = -current_plaid_balance
+
+    is_investment = account.account_type.value in plaid_sync.INVESTMENT_ACCOUNT_TYPES
+    if current_plaid_balance is None or (is_investment and current_plaid_balance == 0.0):
+        first_plaid_txn = next((txn for txn in transactions if txn.plaid_transaction_id is not None), None)
+        if first_plaid_txn:
+            last_statement_txn = None
+            for txn in reversed(transactions):
+                if txn.date < first_plaid_txn.date and txn.plaid_transaction_id is None:
+                    last_statement_txn = txn
+                    break
+
+            if last_statement_txn and (last_statement_txn.actual_balance or last_statement_txn.expected_balance):
+                anchor_balance = last_statement_txn.actual_balance or last_statement_txn.expected_balance
+                running_balance = anchor_balance
+                for txn in transactions:
+                    if txn.date < last_statement_txn.date:
+                        continue
+                    elif txn.id == last_statement_txn.id:
+                        txn.expected_balance = round(anchor_balance, 2)
+                    else:
+                        running_balance += txn.total
+                        txn.expected_balance = round(running_balance, 2)
+                account.balance = transactions[-1].expected_balance
+                return
+
+        running_balance = 0.0
+        for txn in transactions:
+            running_balance += txn.total
+            txn.expected_balance = round(running_balance, 2)
+        account.balance = transactions[-1].expected_balance
+        return
+
+    account.balance = current_plaid_balance
+    running_balance = current_plaid_balance
+    for txn in reversed(transactions):
+        txn.expected_balance = round(running_balance, 2)
+        running_balance -= txn.total
+
+
+def _make_transactions(account_id, count, statement_rows=0, anchor_balance=None):
+    start = datetime(2024, 1, 1)
+    transactions = []
+    for idx in range(count):
+        is_statement = idx < statement_rows
+        transactions.append(SimpleNamespace(
+            id=f"{account_id}-{idx:03d}",
+            account_id=account_id,
+            # Three transactions per day, two of them with the same total, to exercise tie ordering
+            date=start + timedelta(days=idx // 3, hours=idx % 3),
+            total=round(((idx * 37) % 23 - 11) * 1.07, 2) if idx % 3 else 4.35,
+            plaid_transaction_id=None if is_statement else f"p-{account_id}-{idx}",
+            actual_balance=anchor_balance if is_statement and idx == statement_rows - 1 else None,
+            expected_balance=None,
+        ))
+    return transactions
+
+
+def test_update_opening_balances_matches_per_row_calculation(plaid_sync):
+    cases = {
+        # account_id: (account type, Plaid balance, transactions)
+        "chk": ("checking", 1523.17, _make_transactions("chk", 40)),
+        "cc": ("credit_card", 250.0, _make_transactions("cc", 25)),
+        "sav": ("savings", None, _make_transactions("sav", 30, statement_rows=10, anchor_balance=812.4)),
+        "inv": ("investment", 0.0, _make_transactions("inv", 20)),
+    }
+
+    accounts = {
+        account_id: SimpleNamespace(label=account_id, account_type=SimpleNamespace(value=account_type), balance=None)
+        for account_id, (account_type, _, _) in cases.items()
+    }
+    plaid_accounts = [SimpleNamespace(plaid_account_id=f"pa-{account_id}") for account_id in cases]
+    plaid_account_map = {f"pa-{account_id}": account_id for account_id in cases}
+    plaid_balances = {f"pa-{account_id}": balance for account_id, (_, balance, _) in cases.items()}
+
+    rows = [txn for _, _, transactions in cases.values() for txn in transactions]
+    db = _FakeSession(rows)
+    plaid_sync._update_opening_balances(db, plaid_accounts, plaid_account_map, accounts, plaid_balances)
+
+    for account_id, (account_type, balance, _) in cases.items():
+        expected_transactions = [
+            SimpleNamespace(**vars(txn)) for txn in db._rows if txn.account_id == account_id
+        ]
+        expected_account = SimpleNamespace(account_type=SimpleNamespace(value=account_type), balance=None)
+        _reference_opening_balances(plaid_sync, expected_transactions, expected_account, balance)
+
+        assert accounts[account_id].balance == expected_account.balance
+        for txn in expected_transactions:
+            assert db.updates.get(txn.id) == txn.expected_balance, txn.id
+
+
+def test_transaction_upsert_targets_partial_plaid_id_index(plaid_sync):
+    from sqlalchemy.dialects import postgresql
+
+    stmt = plaid_sync._transaction_upsert_statement(plaid_sync.PLAID_TRANSACTION_UPDATE_COLUMNS)
+    sql = " ".join(str(stmt.compile(dialect=postgresql.dialect())).split())
+
+    assert "ON CONFLICT (plaid_transaction_id) WHERE plaid_transaction_id IS NOT NULL DO UPDATE" in sql
+    for column in plaid_sync.PLAID_TRANSACTION_UPDATE_COLUMNS:
+        assert f"{column} = excluded.{column}" in sql
+
+
+def _amounts(count):
+    return [round(((idx * 7919) % 1000 - 480) / 7.0, 2) for idx in range(count)]
+
+
+def test_running_balances_forward_matches_loop(plaid_sync):
+    amounts = _amounts(500)
+
+    expected = [0.0]
+    running_balance = 0.0
+    for amount in amounts:
+        running_balance += amount
+        expected.append(round(running_balance, 2))
+
+    assert plaid_sync._running_balances(0.0, amounts) == expected
+
+
+def test_running_balances_backward_matches_loop(plaid_sync):
+    totals = _amounts(300)
+    current_balance = 10432.19
+
+    expected = []
+    running_balance = current_balance
+    for total in reversed(totals):
+        expected.append(round(running_balance, 2))
+        running_balance -= total
+
+    assert plaid_sync._running_balances(current_balance, [-total for total in reversed(totals[1:])]) == expected
+
+
+def test_running_balances_without_amounts_returns_start(plaid_sync):
+    assert plaid_sync._running_balances(12.345, []) == [12.35]
+
+
+def test_historical_sync_page_reports_remaining_pages(plaid_sync):
+    page = plaid_sync._historical_sync_page(
+        {"transactions": [{"transaction_id": "t1"}, {"transaction_id": "t2"}], "total_transactions": 5},
+        offset=2
+    )
+
+    assert page == {
+        "added": [{"transaction_id": "t1"}, {"transaction_id": "t2"}],
+        "modified": [],
+        "removed": [],
+        "next_cursor": None,
+        "has_more": True,
+    }
+    assert not plaid_sync._historical_sync_page({"transactions": [{}], "total_transactions": 5}, offset=4)["has_more"]
+    assert not plaid_sync._historical_sync_page({"transactions": [], "total_transactions": 5}, offset=2)["has_more"]
+
+
+def test_investment_transaction_amount_signs(plaid_sync):
+    amount = plaid_sync._investment_transaction_amount
+
+    assert amount(-100.0, "cash", "deposit") == 100.0
+    assert amount(25.0, "cash", "interest earned") == 25.0
+    assert amount(-40.0, "cash", "withdrawal") == -40.0
+    assert amount(40.0, "cash", "withdrawal") == -40.0
+    assert amount(250.0, "buy", "buy") == -250.0
+    assert amount(-250.0, "sell", "sell") == 250.0
+    assert amount(-3.5, "dividend", "dividend") == 3.5
+
+
+def test_batch_uuids_are_unique_version_4(plaid_sync):
+    ids = plaid_sync._batch_uuids(50)
+
+    assert len(ids) == len(set(ids)) == 50
+    for value in ids:
+        parsed = uuid.UUID(value)
+        assert parsed.version == 4
+        assert str(parsed) == value
+    assert plaid_sync._batch_uuids(0) == []